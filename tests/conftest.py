@@ -0,0 +1,7 @@
+import os
+import sys
+
+# the modules import each other by plain name, as when run from inside
+# turing_machine/
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "turing_machine"))
@@ -0,0 +1,71 @@
+import random
+
+from engine import CompiledTable, compile_table
+from tape import BLANK, Tape
+
+
+MOVES = {"L": -1, "S": 0, "R": 1}
+
+
+def random_table(
+    rnd: random.Random, state_value: int, alph_value: int, halt: float = 0.1
+) -> list[list[str]]:
+    values = ["N", "_"] + [str(i) for i in range(alph_value)]
+    table = []
+    for _ in range(state_value):
+        row = []
+        for _ in range(alph_value + 1):
+            if rnd.random() < halt:
+                next_state = 0
+            else:
+                next_state = rnd.randint(1, state_value)
+            row.append(
+                f"{rnd.choice(values)} {rnd.choice('LRS')} Q{next_state}"
+            )
+        table.append(row)
+    return table
+
+
+def random_machine(
+    rnd: random.Random, max_states: int, max_alph: int, halt: float = 0.1
+) -> tuple[list[list[str]], int, int, CompiledTable]:
+    # a random table of random size up to the given one, as command
+    # strings and compiled
+    state_value = rnd.randint(1, max_states)
+    alph_value = rnd.randint(1, max_alph)
+    table_data = random_table(rnd, state_value, alph_value, halt)
+    return (
+        table_data, state_value, alph_value,
+        compile_table(table_data, state_value, alph_value),
+    )
+
+
+def random_cells(rnd: random.Random, alph_value: int, length: int):
+    return [
+        rnd.choice([BLANK] * 2 + list(range(1, alph_value + 1)))
+        for _ in range(length)
+    ]
+
+
+def reference_run(table_data, cells, head: int, state: int, max_steps: int):
+    # straight from the command strings, with a dict for a tape
+    tape = dict(enumerate(cells))
+    steps = 0
+    while steps < max_steps and state != 0:
+        val, move, next_state = table_data[state - 1][
+            tape.get(head, BLANK)
+        ].split()
+        if val == "_":
+            tape[head] = BLANK
+        elif val != "N":
+            tape[head] = int(val) + 1
+        head += MOVES[move]
+        state = int(next_state[1:])
+        steps += 1
+    return nonblank(tape), head, state, steps
+
+
+def nonblank(tape) -> dict[int, int]:
+    if isinstance(tape, Tape):
+        tape = dict(zip(range(tape.lo, tape.hi), tape.to_list()))
+    return {pos: code for pos, code in tape.items() if code != BLANK}
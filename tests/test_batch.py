@@ -0,0 +1,41 @@
+import random
+
+from batch import _chunks, parse_input, run_input, run_many
+from engine import compile_table
+from tape import code_symbol
+from tests.helpers import random_cells, random_machine
+
+
+def random_inputs(rnd: random.Random, alph_value: int, count: int):
+    return [
+        [code_symbol(code) for code in random_cells(rnd, alph_value, 5)]
+        for _ in range(count)
+    ]
+
+
+def test_pool_keeps_input_order():
+    rnd = random.Random(0)
+    for _ in range(3):
+        _, _, alph_value, table = random_machine(rnd, 3, 2)
+        inputs = random_inputs(rnd, alph_value, 50)
+        expected = [run_input(table, symbols, 200) for symbols in inputs]
+        assert list(run_many(table, inputs, 200, workers=1)) == expected
+        # more chunks than fit in flight at once
+        assert list(run_many(
+            table, iter(inputs), 200, workers=2, chunk_size=3
+        )) == expected
+
+
+def test_chunks():
+    assert [len(chunk) for chunk in _chunks(iter(range(10)), 4)] == [4, 4, 2]
+    assert list(_chunks([], 4)) == []
+
+
+def test_inputs_and_head():
+    table = compile_table([["0 R Q1", "N R Q0"]], 1, 1)
+    assert parse_input("0 _ 0\n") == ["0", "_", "0"]
+    assert parse_input("0_0") == ["0", "_", "0"]
+    at_end = run_input(table, ["_", "0"], 10)
+    at_start = run_input(table, ["_", "0"], 10, head=0)
+    assert (at_end["head"], at_end["tape"]) == (2, "0")
+    assert (at_start["head"], at_start["tape"]) == (2, "0 0")
@@ -0,0 +1,89 @@
+import random
+
+from cache import ResultCache, cache_key, cached_run, config_hash
+from engine import Engine, compile_table
+from tape import RLETape, make_tape
+from tests.helpers import nonblank, random_cells, random_machine
+
+
+def shifted(engine: Engine, shift: int):
+    return (
+        {pos - shift: code for pos, code in nonblank(engine.tape).items()},
+        engine.head - shift,
+        engine.state,
+        engine.steps,
+    )
+
+
+def test_cached_runs_match_plain_runs(tmp_path):
+    rnd = random.Random(0)
+    for mode in ("array", "sparse", "rle"):
+        directory = str(tmp_path / mode)
+        for _ in range(150):
+            _, _, alph_value, table = random_machine(rnd, 3, 2)
+            cells = random_cells(rnd, alph_value, 6)
+            for max_steps in (50, 500, 50):
+                plain = Engine(table, make_tape(cells, mode), 3, 1)
+                plain.run(max_steps)
+                # a fresh cache each time reads back what earlier ones
+                # wrote to the directory
+                for cache in (ResultCache(directory), ResultCache()):
+                    shift = rnd.randint(-5, 5)
+                    engine = Engine(
+                        table, make_tape(cells, mode, origin=shift),
+                        3 + shift, 1,
+                    )
+                    assert cached_run(cache, engine, max_steps) == (
+                        engine.steps
+                    )
+                    assert shifted(engine, shift) == shifted(plain, 0)
+                    assert type(engine.tape) is type(plain.tape)
+
+
+def test_hits_and_misses(tmp_path):
+    # halts after two steps
+    table = compile_table([["0 R Q2", "N R Q1"], ["0 L Q0", "N L Q0"]], 2, 1)
+    cache = ResultCache(str(tmp_path))
+    for origin in (0, 7, -3):
+        tape = make_tape([0, 1, 1], origin=origin)
+        cached_run(cache, Engine(table, tape, origin, 1), 100)
+    assert (cache.hits, cache.misses) == (2, 1)
+    # a halted run answers any larger limit, but not a smaller one
+    cached_run(cache, Engine(table, make_tape([0, 1, 1]), 0, 1), 10**6)
+    cached_run(cache, Engine(table, make_tape([0, 1, 1]), 0, 1), 1)
+    assert (cache.hits, cache.misses) == (3, 2)
+    reopened = ResultCache(str(tmp_path))
+    cached_run(reopened, Engine(table, make_tape([0, 1, 1]), 0, 1), 100)
+    assert reopened.hits == 1
+
+
+def test_hash_is_translation_invariant():
+    table = compile_table([["0 R Q1", "N R Q1"]], 1, 1)
+
+    def key(cells, origin, head):
+        tape = make_tape(cells, origin=origin)
+        return cache_key(config_hash(table, tape, head, 1), 100)
+
+    assert key([0, 1, 0, 1], 0, 1) == key([1, 0, 1, 0, 0], 10, 10)
+    assert key([0, 1, 0, 1], 0, 1) != key([0, 1, 0, 1], 0, 2)
+    assert key([1], 0, 0) != key([1, 1], 0, 0)
+
+
+def test_long_rle_tape_round_trip():
+    table = compile_table([["1 L Q0"] * 3], 1, 2)
+    runs = [10**7, 3, 10**7]
+    tape = RLETape.from_runs(runs, [1, 0, 2])
+    cache = ResultCache()
+    cached_run(cache, Engine(table, tape, 10**7 + 1, 1), 10)
+    engine = Engine(table, RLETape.from_runs(runs, [1, 0, 2]), 10**7 + 1, 1)
+    cached_run(cache, engine, 10)
+    assert cache.hits == 1
+    assert engine.tape.runs() == tape.runs()
+
+
+def test_wide_alphabets_bypass_the_cache():
+    table = compile_table([["299 R Q1"] * 301], 1, 300)
+    cache = ResultCache()
+    engine = Engine(table, make_tape([], alph_value=300), 0, 1)
+    assert cached_run(cache, engine, 10) == 10
+    assert (cache.hits, cache.misses, len(cache.memory)) == (0, 0, 0)
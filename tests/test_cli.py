@@ -0,0 +1,62 @@
+import json
+import os
+
+import pytest
+
+import cli
+from tests.conftest import ROOT
+
+SAVED_STATES = os.path.join(ROOT, "turing_machine", "saved_states")
+PLUS_ONE = os.path.join(SAVED_STATES, "plus_one.json")
+
+
+@pytest.mark.parametrize("flags", [
+    ["--time-limit", "1"],
+    ["--detect-loops"],
+    ["--optimize"],
+    ["--tape-mode", "rle"],
+    ["--profile", "profile.json"],
+    ["--vectorized", "--accelerate"],
+])
+def test_inputs_reject_flags_they_ignore(flags):
+    with pytest.raises(SystemExit):
+        cli.parse_args(["machine.json", "--inputs", "inputs.txt", *flags])
+
+
+@pytest.mark.parametrize("flags", [
+    [], ["--tape-mode", "rle"], ["--accelerate"], ["--optimize"],
+    ["--cache", "{tmp}"], ["--detect-loops"],
+])
+def test_main_runs_a_saved_machine(tmp_path, capsys, flags):
+    flags = [flag.format(tmp=tmp_path) for flag in flags]
+    assert cli.main([PLUS_ONE, "--json", *flags]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["status"] == "halted"
+    assert (result["steps"], result["tape"]) == (4, "2 0 0 0")
+
+
+def test_main_reports_limits_and_bad_files(tmp_path, capsys):
+    missing = str(tmp_path / "missing.json")
+    profile = str(tmp_path / "profile.json")
+    assert cli.main(
+        [PLUS_ONE, missing, "--max-steps", "2", "--profile", profile]
+    ) == 1
+    captured = capsys.readouterr()
+    assert "step limit after 2 steps" in captured.out
+    assert missing in captured.err
+    with open(profile) as f:
+        assert [report["steps"] for report in json.load(f)] == [2]
+
+
+def test_main_runs_inputs(tmp_path, capsys):
+    inputs = tmp_path / "inputs.txt"
+    inputs.write_text("1 9\n999\n\n0\n")
+    assert cli.main(
+        [PLUS_ONE, "--inputs", str(inputs), "--workers", "1", "--json"]
+    ) == 0
+    results = [
+        json.loads(line) for line in capsys.readouterr().out.splitlines()
+    ]
+    assert [result["tape"] for result in results] == [
+        "2 0", "1 0 0 0", "1"
+    ]
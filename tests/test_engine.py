@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from engine import Engine, compile_table
+from native import AVAILABLE, NativeRunner
+from tape import make_tape
+from tests.helpers import (
+    nonblank,
+    random_cells,
+    random_machine,
+    reference_run,
+)
+
+
+def random_runs(seed: int, count: int):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        table_data, _, alph_value, table = random_machine(rnd, 4, 3)
+        cells = random_cells(rnd, alph_value, rnd.randint(1, 12))
+        head = rnd.randrange(len(cells))
+        max_steps = rnd.randint(0, 500)
+        yield (
+            table_data, table, cells, head, max_steps,
+            reference_run(table_data, cells, head, 1, max_steps),
+        )
+
+
+def result(engine: Engine, done: int):
+    return nonblank(engine.tape), engine.head, engine.state, done
+
+
+@pytest.mark.parametrize("mode", ["array", "sparse", "rle"])
+@pytest.mark.parametrize("accelerate", [False, True])
+def test_tapes_match_reference(mode, accelerate):
+    runs = random_runs(1, 300)
+    for table_data, table, cells, head, max_steps, expected in runs:
+        engine = Engine(table, make_tape(cells, mode), head, 1)
+        done = engine.run(max_steps, accelerate)
+        assert result(engine, done) == expected, table_data
+
+
+def test_runs_in_batches_match_one_run():
+    runs = random_runs(2, 200)
+    for table_data, table, cells, head, max_steps, expected in runs:
+        engine = Engine(table, make_tape(cells), head, 1)
+        done = 0
+        while done < max_steps and not engine.halted:
+            done += engine.run(min(7, max_steps - done))
+        assert result(engine, done) == expected, table_data
+
+
+@pytest.mark.skipif(not AVAILABLE, reason="numba is not installed")
+def test_numba_matches_reference():
+    runs = random_runs(3, 200)
+    for table_data, table, cells, head, max_steps, expected in runs:
+        engine = Engine(table, make_tape(cells), head, 1)
+        engine.native = NativeRunner(table)
+        done = engine.run(max_steps)
+        assert result(engine, done) == expected, table_data
+
+
+def test_wide_alphabet_runs_on_sparse_tape():
+    table = compile_table([["299 R Q1"] * 301], 1, 300)
+    engine = Engine(table, make_tape([], alph_value=300), 0, 1)
+    assert engine.run(5) == 5
+    assert nonblank(engine.tape) == {pos: 300 for pos in range(5)}
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from app import TuringMachineApp
+from engine import Engine, compile_table
+from history import History
+from tape import make_tape
+from tests.helpers import nonblank, random_cells, random_machine
+
+
+def state_at(table, cells, steps: int):
+    engine = Engine(table, make_tape(cells), 0, 1)
+    engine.run(steps)
+    return nonblank(engine.tape), engine.head, engine.state
+
+
+def current(engine: Engine):
+    return nonblank(engine.tape), engine.head, engine.state
+
+
+@pytest.mark.parametrize("checkpoint_every", [5, 50, 10000])
+def test_steps_batches_and_jumps_match_plain_runs(checkpoint_every):
+    rnd = random.Random(checkpoint_every)
+    for _ in range(150):
+        _, _, alph_value, table = random_machine(rnd, 4, 3, halt=0)
+        cells = random_cells(rnd, alph_value, 6)
+        history = History(checkpoint_every)
+        engine = Engine(table, make_tape(cells), 0, 1)
+        for _ in range(30):
+            action = rnd.random()
+            if action < 0.3:
+                history.run(engine, 1)
+            elif action < 0.5:
+                history.run_batch(
+                    engine, rnd.randint(2, 300), rnd.random() < 0.5
+                )
+            elif action < 0.8:
+                history.step_back(engine)
+            else:
+                history.jump_to(
+                    engine, rnd.randint(history.first_step, history.step + 200)
+                )
+            assert current(engine) == state_at(table, cells, history.step)
+
+
+def test_step_back_stops_at_first_step():
+    table = compile_table([["0 R Q1", "0 R Q1"]], 1, 1)
+    history = History()
+    engine = Engine(table, make_tape([0, 0]), 0, 1)
+    history.run(engine, 3)
+    assert [history.step_back(engine) for _ in range(4)] == [
+        True, True, True, False
+    ]
+    assert engine.head == 0 and nonblank(engine.tape) == {}
+
+
+def test_jump_before_history_is_rejected():
+    table = compile_table([["0 R Q1", "0 R Q1"]], 1, 1)
+    history = History(checkpoint_every=10, max_bytes=0)
+    engine = Engine(table, make_tape([0]), 0, 1)
+    history.run(engine, 100)
+    with pytest.raises(ValueError):
+        history.jump_to(engine, 0)
+
+
+def test_batches_copy_the_tape_rarely():
+    table = compile_table([["0 R Q1", "_ L Q1"]], 1, 1)
+    history = History(checkpoint_every=10)
+    engine = Engine(table, make_tape([0] * 10**5), 0, 1)
+    for _ in range(50):
+        history.run_batch(engine, 100)
+    # a checkpoint costs a copy of the whole tape, so batches take one
+    # only once they ran as many steps as the tape has bytes
+    assert [c.step for c in history.checkpoints] == [0]
+    history.step_back(engine)
+    assert current(engine) == state_at(table, [0] * 10**5, 4999)
+
+
+def test_app_jumps_and_steps_back():
+    machine = TuringMachineApp(
+        state_value=2,
+        alph_value=1,
+        table_data=[["0 R Q2", "_ L Q2"], ["0 L Q1", "_ R Q1"]],
+    )
+    table = machine.compiled_table()
+    cells = list(machine.tape.cells(machine.tape.lo, machine.tape.hi))
+    head = machine.current_tape_cell
+
+    def expected(steps):
+        engine = Engine(table, make_tape(cells), head, 1)
+        engine.run(steps)
+        return nonblank(engine.tape), engine.head, engine.state
+
+    def actual():
+        return (
+            nonblank(machine.tape),
+            machine.current_tape_cell,
+            machine.current_table_state,
+        )
+
+    machine.run_steps(10000)
+    machine.single_step()
+    machine.step_back()
+    machine.step_back()
+    assert actual() == expected(9999)
+    machine.jump_to_step(1234)
+    assert actual() == expected(1234)
+    machine.jump_to_step(20000)
+    assert actual() == expected(20000)
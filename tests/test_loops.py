@@ -0,0 +1,50 @@
+import random
+
+from engine import Engine, compile_table
+from loops import LoopDetector, tape_contents, tape_hash
+from tape import make_tape
+from tests.helpers import random_cells, random_machine
+
+
+def config(engine: Engine):
+    first, cells = tape_contents(engine.tape)
+    return engine.state, engine.head, first, cells
+
+
+def test_detected_loops_repeat_with_their_period():
+    rnd = random.Random(0)
+    loops = 0
+    for _ in range(400):
+        _, _, alph_value, table = random_machine(rnd, 3, 2)
+        cells = random_cells(rnd, alph_value, 6)
+        engine = Engine(table, make_tape(cells), 3, 1)
+        detector = LoopDetector(engine)
+        detector.run(2000)
+        if detector.loop is None:
+            continue
+        loops += 1
+        assert not engine.halted
+        assert detector.loop.detected_at == engine.steps
+        start = config(engine)
+        for step in range(1, detector.loop.period + 1):
+            engine.run(1)
+            # back where it was after exactly one period, not before
+            assert (config(engine) == start) == (
+                step == detector.loop.period
+            )
+    assert loops > 50
+
+
+def test_no_loop_without_a_repeat():
+    # a counter never repeats its tape
+    table = compile_table([["0 L Q2", "N R Q1"], ["0 R Q1", "_ L Q2"]], 2, 1)
+    engine = Engine(table, make_tape([0] * 4), 0, 1)
+    detector = LoopDetector(engine)
+    detector.run(10000)
+    assert detector.loop is None and engine.steps == 10000
+
+
+def test_hash_ignores_blank_cells():
+    cells = [0, 1, 2, 0]
+    assert tape_hash(make_tape(cells)) == tape_hash(make_tape(cells + [0] * 9))
+    assert tape_hash(make_tape(cells)) != tape_hash(make_tape([0] + cells))
@@ -0,0 +1,58 @@
+import random
+
+from engine import HALT, Engine, compile_table
+from optimize import optimize, optimize_machine, table_data
+from tape import make_tape
+from tests.helpers import nonblank, random_cells, random_machine
+
+
+def test_optimized_tables_run_the_same():
+    rnd = random.Random(0)
+    for _ in range(400):
+        data, state_value, alph_value, table = random_machine(rnd, 6, 3)
+        result = optimize(table)
+        assert result.table.state_value <= state_value
+        cells = random_cells(rnd, alph_value, 10)
+        original = Engine(table, make_tape(cells), 5, 1)
+        optimized = Engine(result.table, make_tape(cells), 5, 1)
+        assert original.run(300) == optimized.run(300), data
+        assert nonblank(original.tape) == nonblank(optimized.tape), data
+        assert original.head == optimized.head, data
+        assert result.states.get(original.state, HALT) == optimized.state
+
+
+def test_table_data_inverts_compile_table():
+    rnd = random.Random(1)
+    for _ in range(50):
+        _, state_value, alph_value, table = random_machine(rnd, 4, 3)
+        assert compile_table(
+            table_data(table), state_value, alph_value
+        ) == table
+
+
+def test_unreachable_and_equivalent_states():
+    table = compile_table(
+        [
+            ["N R Q2", "N R Q2"],
+            ["0 R Q3", "N R Q3"],
+            ["0 R Q2", "N R Q2"],
+            ["_ L Q0", "_ L Q0"],
+        ],
+        4, 1,
+    )
+    result = optimize(table)
+    assert result.removed == [4]
+    assert result.merged == [[2, 3]]
+    assert result.table.state_value == 2
+
+
+def test_machine_keeps_current_state_reachable():
+    data = {
+        "state_value": 2,
+        "alph_value": 1,
+        "table_data": [["0 R Q1", "N R Q1"], ["_ L Q0", "_ L Q0"]],
+        "current_table_state": 2,
+    }
+    optimized, result = optimize_machine(data)
+    assert optimized["state_value"] == 2
+    assert optimized["current_table_state"] == result.states[2]
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from engine import Engine, compile_table
+from overview import TapeOverview
+from tape import MAX_ARRAY_ALPH, make_tape
+from tests.helpers import random_cells, random_machine
+
+
+def expected_pixels(tape, image) -> bytes:
+    # each pixel is the highest code among its cells, capped at a byte
+    scale = image.scale
+    return bytes(
+        min(max(tape.cells(cell, cell + scale)), MAX_ARRAY_ALPH)
+        for cell in range(
+            image.lo, image.lo + len(image.pixels) * scale, scale
+        )
+    )
+
+
+@pytest.mark.parametrize("view", [(64, None, None), (16, -20, 100)])
+@pytest.mark.parametrize("mode", ["array", "sparse", "rle"])
+def test_repaints_match_a_full_paint(mode, view):
+    rnd = random.Random(0)
+    for _ in range(40):
+        _, _, alph_value, table = random_machine(rnd, 4, 3, halt=0)
+        engine = Engine(
+            table, make_tape(random_cells(rnd, alph_value, 20), mode), 10, 1
+        )
+        overview = TapeOverview(alph_value)
+        overview.request = view
+        for _ in range(20):
+            engine.run(rnd.randint(0, 40))
+            if rnd.random() < 0.2:
+                # an edit at the head, as the GUI makes between runs
+                engine.tape[engine.head] = rnd.randint(0, alph_value)
+            image = overview.update(engine.tape, engine.head, engine.steps)
+            assert image.pixels == expected_pixels(engine.tape, image)
+            assert image.head == engine.head
+
+
+def test_only_cells_in_reach_are_read():
+    overview = TapeOverview(1)
+    overview.request = (8, 0, 64)
+    tape = make_tape([0] * 64)
+    overview.update(tape, 30, 0)
+    # a write the machine couldn't have made in one step stays unseen
+    tape[0] = 1
+    tape[31] = 1
+    image = overview.update(tape, 31, 1)
+    assert image.scale == 8 and image.pixels == bytes([0, 0, 0, 1] + [0] * 4)
+
+
+def test_wide_alphabets_share_the_last_color():
+    table = compile_table([["299 R Q1"] * 301], 1, 300)
+    engine = Engine(table, make_tape([], alph_value=300), 0, 1)
+    overview = TapeOverview(300)
+    overview.request = (8, 0, 8)
+    engine.run(3)
+    image = overview.update(engine.tape, engine.head, engine.steps)
+    assert image.pixels == bytes([MAX_ARRAY_ALPH] * 3 + [0] * 5)
@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+
+from engine import Engine, cell_name, compile_table
+from profiling import Profile
+from tape import make_tape
+from tests.helpers import nonblank, random_cells, random_machine
+
+
+def test_counts_match_the_cells_fired():
+    rnd = random.Random(0)
+    for _ in range(200):
+        _, state_value, alph_value, table = random_machine(rnd, 4, 3)
+        cells = random_cells(rnd, alph_value, 8)
+        plain = Engine(table, make_tape(cells), 4, 1)
+        fired = Counter()
+        heads = Counter()
+        while plain.steps < 300 and not plain.halted:
+            fired[
+                (plain.state - 1) * table.width + plain.tape[plain.head]
+            ] += 1
+            heads[plain.head // 3] += 1
+            plain.run(1)
+        profiled = Engine(table, make_tape(cells), 4, 1)
+        profiled.profile = Profile(table, bucket=3)
+        # in two parts, as the GUI runs it
+        profiled.run(100)
+        profiled.run(200)
+        profile = profiled.profile
+        assert profiled.steps == plain.steps == profile.steps
+        assert nonblank(profiled.tape) == nonblank(plain.tape)
+        assert (profiled.head, profiled.state) == (plain.head, plain.state)
+        assert profile.cell_counts == [
+            fired[cell] for cell in range(len(table.write))
+        ]
+        assert profile.head_counts == heads
+        assert len(profile.heatmap()) == state_value
+        assert all(len(row) == alph_value + 1 for row in profile.heatmap())
+
+
+def test_report_names_hot_transitions():
+    # sweeps right over blanks, then stops on the first 0
+    table = compile_table([["0 R Q1", "N L Q0"]], 1, 1)
+    engine = Engine(table, make_tape([0, 0, 0, 1]), 0, 1)
+    engine.profile = Profile(table, bucket=2)
+    engine.run(100)
+    report = engine.profile.report()
+    assert report["steps"] == 4
+    assert report["hot_transitions"] == [
+        {"cell": cell_name(0, 0), "count": 3},
+        {"cell": cell_name(0, 1), "count": 1},
+    ]
+    assert report["hot_transitions"][0]["cell"] == "_-Q1"
+    assert report["heatmap"] == [[3, 1]]
+    assert report["head_histogram"] == {"0": 2, "2": 2}
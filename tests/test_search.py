@@ -0,0 +1,109 @@
+import json
+import os
+import random
+
+import pytest
+
+import search
+from engine import HALT, Engine, compile_table
+from search import HALTED, TRANSLATED, Enumeration, run_search
+from tape import format_tape, make_tape
+
+
+def shard_contents(directory: str) -> dict[str, bytes]:
+    contents = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".ndjson"):
+            with open(os.path.join(directory, name), "rb") as f:
+                contents[name] = f.read()
+    return contents
+
+
+@pytest.mark.parametrize("size, best_steps", [((2, 1), 6), ((3, 1), 21)])
+def test_busy_beaver_steps(tmp_path, size, best_steps):
+    stats = run_search(str(tmp_path), *size, max_steps=100)
+    assert stats["best_steps"] == best_steps
+
+
+def test_resume_after_interrupts(tmp_path, monkeypatch):
+    params = dict(
+        state_value=3, alph_value=1, max_steps=100,
+        shard_size=500, checkpoint_every=300,
+    )
+    whole = str(tmp_path / "whole")
+    expected = run_search(whole, **params)
+
+    simulate = search.simulate
+    calls = 0
+    stop_at = 0
+
+    def interrupted(*args):
+        nonlocal calls
+        calls += 1
+        if calls == stop_at:
+            raise KeyboardInterrupt
+        return simulate(*args)
+
+    monkeypatch.setattr(search, "simulate", interrupted)
+    rnd = random.Random(0)
+    resumed = str(tmp_path / "resumed")
+    for _ in range(15):
+        calls = 0
+        stop_at = rnd.randint(1, 3000)
+        with pytest.raises(KeyboardInterrupt):
+            run_search(resumed, **params)
+    stop_at = 0
+    assert run_search(resumed, **params) == expected
+    assert shard_contents(resumed) == shard_contents(whole)
+
+
+def test_resume_checks_parameters(tmp_path):
+    run_search(str(tmp_path), 2, 1, 50)
+    with pytest.raises(ValueError):
+        run_search(str(tmp_path), 2, 1, 60)
+
+
+@pytest.mark.parametrize("state_value, alph_value, every", [
+    (2, 1, 1), (3, 1, 10),
+])
+def test_translated_cycles_never_halt(state_value, alph_value, every):
+    # a long plain run of the machines reported as translated
+    width = alph_value + 1
+    translated = [
+        cells
+        for cells, outcome in Enumeration(state_value, alph_value, 1000)
+        if outcome.status == TRANSLATED
+    ]
+    assert translated
+    for cells in translated[::every]:
+        tape, head, state = {}, 0, 1
+        for _ in range(2000):
+            entry = cells[(state - 1) * width + tape.get(head, 0)]
+            assert entry is not None and entry[2] != HALT, cells
+            val, step, state = entry
+            tape[head] = val
+            head += step
+
+
+def test_halted_machines_are_not_cut_short():
+    halted = [
+        outcome.steps
+        for cells, outcome in Enumeration(2, 1, 1000)
+        if outcome.status == HALTED
+    ]
+    assert len(halted) == 18 and max(halted) == 6
+
+
+def test_recorded_tables_replay_their_runs(tmp_path):
+    run_search(str(tmp_path), 2, 2, 200)
+    with open(tmp_path / "halted-00000.ndjson") as f:
+        records = [json.loads(line) for line in f]
+    assert records
+    for record in records:
+        table = compile_table(
+            record["table_data"], record["state_value"], record["alph_value"]
+        )
+        engine = Engine(table, make_tape(), 0, 1)
+        engine.run(record["steps"] + 1)
+        assert engine.halted and engine.steps == record["steps"]
+        assert format_tape(engine.tape) == record["tape"]
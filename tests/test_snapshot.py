@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from app import TuringMachineApp
+from snapshot import SUFFIX, Snapshot, load_machine, save_machine_data
+from tape import RLETape, SparseTape, make_tape
+from tests.helpers import nonblank
+
+
+def machine_data(mode: str, alph_value: int = 3) -> dict:
+    tape = make_tape(
+        [0, 1, 2, 0, 0, 3, 3, 3, 1], mode, origin=-4, alph_value=alph_value
+    )
+    tape[40] = alph_value
+    return {
+        "state_value": 2,
+        "alph_value": alph_value,
+        "is_ready_to_start": True,
+        "is_on": False,
+        "current_table_state": 2,
+        "table_data": [
+            ["_ R Q1"] * (alph_value + 1), ["N L Q0"] * (alph_value + 1)
+        ],
+        "tape": tape,
+        "current_tape_cell": 3,
+        "tape_mode": mode,
+    }
+
+
+def assert_same_machine(loaded: dict, data: dict) -> None:
+    # tapes come back starting at cell 0, so positions are compared
+    # relative to the head
+    for key in ("state_value", "alph_value", "current_table_state"):
+        assert loaded[key] == data[key]
+    assert loaded["table_data"] == data["table_data"]
+    shift = loaded["current_tape_cell"] - data["current_tape_cell"]
+    assert nonblank(loaded["tape"]) == {
+        pos + shift: code for pos, code in nonblank(data["tape"]).items()
+    }
+
+
+@pytest.mark.parametrize("suffix", [".json", SUFFIX])
+@pytest.mark.parametrize("mode", ["array", "sparse", "rle"])
+def test_round_trip(tmp_path, suffix, mode):
+    data = machine_data(mode)
+    path = str(tmp_path / f"machine{suffix}")
+    save_machine_data(path, data)
+    loaded = load_machine(path)
+    assert_same_machine(loaded, data)
+    assert loaded["tape_mode"] == mode
+    assert type(loaded["tape"]) is type(data["tape"])
+
+
+@pytest.mark.parametrize("suffix", [".json", SUFFIX])
+def test_wide_alphabet_round_trip(tmp_path, suffix):
+    data = machine_data("array", alph_value=300)
+    assert isinstance(data["tape"], SparseTape)
+    path = str(tmp_path / f"machine{suffix}")
+    save_machine_data(path, data)
+    loaded = load_machine(path)
+    assert_same_machine(loaded, data)
+    assert isinstance(loaded["tape"], SparseTape)
+
+
+def test_json_is_plain_symbols(tmp_path):
+    path = str(tmp_path / "machine.json")
+    save_machine_data(path, machine_data("array"))
+    with open(path) as f:
+        saved = json.load(f)
+    assert saved["tape"][:9] == ["_", 0, 1, "_", "_", 2, 2, 2, 0]
+    assert saved["current_tape_cell"] == 7
+
+
+def test_rle_snapshot_keeps_runs(tmp_path):
+    tape = RLETape.from_runs([10**9, 5, 10**9], [1, 0, 2])
+    data = machine_data("rle")
+    data["tape"] = tape
+    path = str(tmp_path / f"machine{SUFFIX}")
+    save_machine_data(path, data)
+    snapshot = Snapshot(path)
+    try:
+        assert [list(column) for column in snapshot.runs] == [
+            [10**9, 5, 10**9], [1, 0, 2]
+        ]
+    finally:
+        snapshot.close()
+
+
+def test_app_save_and_load(tmp_path):
+    machine = TuringMachineApp(
+        state_value=1, alph_value=1, table_data=[["0 R Q1", "_ R Q1"]]
+    )
+    machine.run_steps(25)
+    for suffix in (".json", SUFFIX):
+        path = str(tmp_path / f"machine{suffix}")
+        machine.save_to_file(path)
+        loaded = TuringMachineApp(**load_machine(path))
+        shift = loaded.current_tape_cell - machine.current_tape_cell
+        assert nonblank(loaded.tape) == {
+            pos + shift: code for pos, code in nonblank(machine.tape).items()
+        }
+        assert loaded.table_data == machine.table_data
@@ -0,0 +1,59 @@
+import random
+import re
+
+import pytest
+
+from engine import TableBuilder, compile_table
+from tests.helpers import random_machine, random_table
+
+
+def test_edits_match_a_fresh_compile():
+    rnd = random.Random(0)
+    for _ in range(50):
+        data, state_value, alph_value, table = random_machine(rnd, 4, 3)
+        builder = TableBuilder(data, state_value, alph_value)
+        assert builder.compiled() == table
+        commands = sum(random_table(rnd, state_value, alph_value), [])
+        for _ in range(20):
+            row = rnd.randrange(state_value)
+            col = rnd.randrange(alph_value + 1)
+            if rnd.random() < 0.2:
+                command = rnd.choice(["", "x R Q1", "0 U Q1", "N S Q99"])
+            else:
+                command = rnd.choice(commands)
+            data[row][col] = command
+            builder.set_cell(row, col, command)
+            try:
+                expected = compile_table(data, state_value, alph_value)
+            except ValueError as e:
+                assert not builder.valid
+                with pytest.raises(ValueError, match=re.escape(str(e))):
+                    builder.compiled()
+            else:
+                assert builder.valid and builder.compiled() == expected
+
+
+def test_compiled_table_is_kept_until_a_cell_changes():
+    data = [["0 R Q1", "N L Q0"]]
+    builder = TableBuilder(data, 1, 1)
+    table = builder.compiled()
+    assert builder.set_cell(0, 0, "0 R Q1") is None
+    assert builder.compiled() is table
+    builder.set_cell(0, 0, "_ R Q1")
+    assert builder.compiled() is not table
+    assert builder.compiled().write[0] == 0
+
+
+def test_all_errors_in_one_pass():
+    data = [["0 R Q1", "x R Q1", "0 R"], ["0 R Q3", "0 R Q0", "N S Q1"]]
+    builder = TableBuilder(data, 2, 2)
+    assert builder.error_messages() == [
+        "Wrong new value x, cell 0-Q1",
+        "Wrong number of arguments, cell 1-Q1",
+        "Wrong next step value Q3, cell _-Q2",
+    ]
+    builder.set_cell(0, 1, "0 R Q1")
+    assert len(builder.error_messages()) == 2
+    with pytest.raises(ValueError) as raised:
+        builder.compiled()
+    assert str(raised.value).count("\n") == 1
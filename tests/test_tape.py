@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from tape import RLETape, SparseTape, Tape, format_tape, make_tape
+from tests.helpers import nonblank
+
+
+@pytest.mark.parametrize("mode", ["array", "sparse", "rle"])
+def test_tapes_match_a_dict(mode):
+    rnd = random.Random(0)
+    for _ in range(200):
+        tape = make_tape([], mode)
+        expected = {}
+        for _ in range(50):
+            pos = rnd.randint(-40, 40)
+            code = rnd.choice([0, 0, 1, 2])
+            tape[pos] = code
+            expected[pos] = code
+            assert tape.lo < pos < tape.hi - 1
+        assert nonblank(tape) == nonblank(expected)
+        first, end = tape.used()
+        if expected := nonblank(expected):
+            assert (first, end) == (min(expected), max(expected) + 1)
+        else:
+            assert (first, end) == (0, 0)
+
+
+def test_tape_is_abstract():
+    with pytest.raises(TypeError):
+        Tape()
+
+
+@pytest.mark.parametrize("mode", ["array", "sparse", "rle"])
+def test_copies_are_independent(mode):
+    tape = make_tape([1, 2, 0, 1], mode, origin=-2)
+    copy = tape.copy()
+    copy[0] = 2
+    copy[-10] = 1
+    assert nonblank(tape) == {-2: 1, -1: 2, 1: 1}
+    assert (tape.lo, tape.hi) == (-2, 2)
+    assert nonblank(copy) == {-10: 1, -2: 1, -1: 2, 0: 2, 1: 1}
+
+
+def test_format_tape():
+    assert format_tape(make_tape([0, 0])) == "_"
+    for mode in ("array", "sparse", "rle"):
+        tape = make_tape([0, 1, 0, 0, 3, 0], mode, origin=-7)
+        assert format_tape(tape) == "0 _ _ 2"
+    wide = SparseTape([0, 300, 0, 1])
+    assert format_tape(wide) == "299 _ 0"
+
+
+def test_format_long_rle_tape():
+    tape = RLETape.from_runs([5, 10**7, 2, 1, 4], [0, 2, 0, 1, 0])
+    text = format_tape(tape)
+    assert len(text) == 2 * (10**7 + 3) - 1
+    assert text.startswith("1 1 ") and text.endswith(" 1 _ _ 0")
@@ -0,0 +1,72 @@
+import json
+import random
+
+import pytest
+
+from engine import Engine
+from tape import code_symbol, make_tape
+from tests.helpers import nonblank, random_cells, random_machine
+from tracing import SUFFIX, read_trace, trace_chunks, write_trace
+
+
+def stepped_records(table, cells, max_steps: int):
+    # (step, state, head, read, written) from single steps of a plain run
+    engine = Engine(table, make_tape(cells), 3, 1)
+    records = []
+    while engine.steps < max_steps and not engine.halted:
+        step, state, head = engine.steps, engine.state, engine.head
+        read = engine.tape[head]
+        engine.run(1)
+        records.append((step, state, head, read, engine.tape[head]))
+    return records, engine
+
+
+def test_binary_trace_round_trip(tmp_path):
+    rnd = random.Random(0)
+    path = str(tmp_path / f"trace{SUFFIX}")
+    for _ in range(100):
+        _, _, alph_value, table = random_machine(rnd, 4, 3)
+        cells = random_cells(rnd, alph_value, 6)
+        expected, plain = stepped_records(table, cells, 300)
+        engine = Engine(table, make_tape(cells), 3, 1)
+        assert write_trace(path, engine, 300, chunk_size=7) == len(expected)
+        chunks = list(read_trace(path))
+        assert all(len(chunk) <= 7 for chunk in chunks)
+        assert [
+            record for chunk in chunks for record in chunk.records()
+        ] == expected
+        assert nonblank(engine.tape) == nonblank(plain.tape)
+        assert (engine.head, engine.state) == (plain.head, plain.state)
+
+
+def test_json_lines_trace(tmp_path):
+    rnd = random.Random(1)
+    path = str(tmp_path / "trace.ndjson")
+    _, _, alph_value, table = random_machine(rnd, 3, 2, halt=0)
+    cells = random_cells(rnd, alph_value, 6)
+    expected, _ = stepped_records(table, cells, 50)
+    write_trace(path, Engine(table, make_tape(cells), 3, 1), 50)
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    assert lines == [
+        {
+            "step": step, "state": state, "head": head,
+            "read": code_symbol(read), "written": code_symbol(written),
+        }
+        for step, state, head, read, written in expected
+    ]
+
+
+def test_chunks_leave_the_engine_current():
+    *_, table = random_machine(random.Random(2), 2, 1, halt=0)
+    engine = Engine(table, make_tape([0] * 4), 0, 1)
+    for chunk in trace_chunks(engine, 25, chunk_size=10):
+        assert engine.steps == chunk.first_step + len(chunk)
+    assert engine.steps == 25
+
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path / "trace.tmt"
+    path.write_bytes(b"not a trace")
+    with pytest.raises(ValueError):
+        list(read_trace(str(path)))
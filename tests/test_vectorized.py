@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from batch import run_many
+from engine import Engine, compile_table
+from tape import code_symbol, make_tape
+from tests.helpers import nonblank, random_cells, random_machine, random_table
+
+pytest.importorskip("numpy")
+
+from vectorized import VectorEngine, run_many_vectorized  # noqa: E402
+
+
+def test_matches_run_many():
+    rnd = random.Random(0)
+    for _ in range(20):
+        _, _, alph_value, table = random_machine(rnd, 4, 3)
+        inputs = [
+            [code_symbol(code) for code in random_cells(rnd, alph_value, 6)]
+            for _ in range(30)
+        ]
+        for head in (None, 0):
+            assert list(run_many_vectorized(
+                table, inputs, 300, head, block_size=7
+            )) == list(run_many(table, inputs, 300, workers=1, head=head))
+
+
+def test_tables_side_by_side():
+    rnd = random.Random(1)
+    tables = [
+        compile_table(random_table(rnd, 3, 2), 3, 2) for _ in range(5)
+    ]
+    tapes = [random_cells(rnd, 2, rnd.randint(1, 8)) for _ in range(40)]
+    heads = [rnd.randrange(len(tape)) for tape in tapes]
+    table_ids = [rnd.randrange(len(tables)) for _ in tapes]
+    engine = VectorEngine(tables, tapes, heads, table_ids=table_ids)
+    engine.run(200)
+    for row, tape in enumerate(tapes):
+        plain = Engine(tables[table_ids[row]], make_tape(tape), heads[row], 1)
+        plain.run(200)
+        assert nonblank(engine.tape(row)) == nonblank(plain.tape)
+        assert engine.head(row) == plain.head
+        assert int(engine.steps[row]) == plain.steps
+        assert bool(engine.halted[row]) == plain.halted
+
+
+def test_wide_alphabet():
+    table = compile_table([["299 R Q0"] * 301], 1, 300)
+    inputs = [["5"], ["299", "_"]]
+    assert [
+        result["tape"] for result in run_many_vectorized(table, inputs, 10)
+    ] == ["299", "299 299"]
+    assert list(run_many_vectorized(table, inputs, 10)) == list(
+        run_many(table, inputs, 10, workers=1)
+    )
+
+
+def test_tables_must_share_a_size():
+    tables = [
+        compile_table([["0 R Q1", "0 R Q1"]], 1, 1),
+        compile_table([["0 R Q1"] * 3], 1, 2),
+    ]
+    with pytest.raises(ValueError):
+        VectorEngine(tables, [[0]], [0])
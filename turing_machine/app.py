@@ -0,0 +1,235 @@
+from dataclasses import dataclass, field, fields
+
+from cache import (
+    CachedResult,
+    ResultCache,
+    cache_key,
+    cacheable,
+    config_hash,
+)
+from engine import CompiledTable, Engine, TableBuilder
+from tape import Tape, TapeWindow, make_tape, symbol_code
+from history import History
+from overview import OverviewImage, TapeOverview
+from profiling import Profile
+from snapshot import save_machine_data
+
+
+@dataclass(frozen=True)
+class MachineSnapshot:
+    step: int
+    head: int
+    state: int
+    tape: TapeWindow
+    overview: OverviewImage | None = None
+
+
+@dataclass
+class TuringMachineApp:
+    state_value: int
+    alph_value: int
+    is_ready_to_start: bool = True
+    is_on: bool = False
+    current_table_state: int = 1
+    table_data: list[list[str]] = field(default_factory=list)
+    tape: Tape | list[str] = field(default_factory=lambda: ["_"] * 30)
+    current_tape_cell: int = 15
+    tape_mode: str = "array"
+
+    def __post_init__(self) -> None:
+        self.profiling = False
+        self.profile = None
+        self.backend = "python"
+        self.native = None
+        # runs flat out skip sweeps over equal cells, see Engine.run
+        self.accelerate = False
+        self.cache: ResultCache | None = None
+        self.run_start = None
+        self.overview: TapeOverview | None = None
+        self.history = History()
+        if not isinstance(self.tape, Tape):
+            self.tape = make_tape(
+                [symbol_code(value) for value in self.tape],
+                self.tape_mode,
+                alph_value=self.alph_value,
+            )
+        self.check_tape_expantion()
+        # one command per cell, like the table editor always saved it
+        width = self.alph_value + 1
+        self.table_data = [
+            (list(row) + [""] * width)[:width]
+            for row in self.table_data[:self.state_value]
+        ]
+        while len(self.table_data) < self.state_value:
+            self.table_data.append([""] * width)
+
+    def table_builder(self) -> TableBuilder:
+        if getattr(self, "_builder_source", None) is not self.table_data:
+            self._builder = TableBuilder(
+                self.table_data, self.state_value, self.alph_value
+            )
+            self._builder_source = self.table_data
+        return self._builder
+
+    def compiled_table(self) -> CompiledTable:
+        return self.table_builder().compiled()
+
+    def set_table_cell(self, row: int, col: int, command: str) -> str | None:
+        builder = self.table_builder()
+        while len(self.table_data) <= row:
+            self.table_data.append([])
+        row_data = self.table_data[row]
+        while len(row_data) <= col:
+            row_data.append("")
+        row_data[col] = command
+        return builder.set_cell(row, col, command)
+
+    def check_tape_expantion(self) -> None:
+        self.tape.ensure(self.current_tape_cell)
+
+    def single_step(self, table: CompiledTable | None = None) -> bool:
+        return self.run_steps(1, table)
+
+    def __engine(self, table: CompiledTable | None = None) -> Engine:
+        # runs pass the table they compiled as they started, so edits made
+        # while they run can't swap it under them
+        return Engine(
+            table or self.compiled_table(),
+            self.tape,
+            self.current_tape_cell,
+            self.current_table_state or 1,
+        )
+
+    def __apply(self, engine: Engine) -> None:
+        self.tape = engine.tape
+        self.current_tape_cell = engine.head
+        self.current_table_state = engine.state
+
+    def run_steps(
+        self, max_steps: int, table: CompiledTable | None = None
+    ) -> bool:
+        engine = self.__engine(table)
+        if self.profiling:
+            if self.profile is None or not self.profile.matches(engine.table):
+                self.profile = Profile(engine.table)
+            engine.profile = self.profile
+            engine.run(max_steps)
+            self.history.reset(self.history.step + engine.steps)
+        elif max_steps == 1:
+            # single and paused steps record a delta each, so stepping
+            # back over them is cheap
+            self.history.run(engine, 1)
+        else:
+            if self.backend != "python":
+                from native import NativeRunner
+                if self.native is None or (
+                    self.native.table is not engine.table
+                ):
+                    self.native = NativeRunner(engine.table)
+                engine.native = self.native
+            self.history.run_batch(engine, max_steps, self.accelerate)
+        self.__apply(engine)
+        if engine.halted:
+            self.__store_run(engine)
+            self.current_table_state = 1
+            return False
+        return True
+
+    def run_from_cache(self, table: CompiledTable | None = None) -> bool:
+        # called as a run to halt starts; if the cache knows where this
+        # configuration halts, jump there, otherwise remember the start so
+        # run_steps can store the run once it halts
+        self.run_start = None
+        if self.cache is None or self.profiling:
+            return False
+        engine = self.__engine(table)
+        if not cacheable(engine.table):
+            return False
+        config = config_hash(
+            engine.table, engine.tape, engine.head, engine.state
+        )
+        key = cache_key(config, None)
+        result = self.cache.get(key)
+        if result is None:
+            self.cache.misses += 1
+            self.run_start = (
+                key, engine.table, engine.head, self.history.step
+            )
+            return False
+        self.cache.hits += 1
+        result.apply(engine)
+        self.__apply(engine)
+        self.history.reset(self.history.step + result.steps)
+        self.current_table_state = 1
+        return True
+
+    def __store_run(self, engine: Engine) -> None:
+        if self.run_start is None:
+            return
+        key, table, head, step = self.run_start
+        self.run_start = None
+        if engine.table is table:
+            self.cache.put(key, CachedResult.from_engine(
+                engine, head, self.history.step - step
+            ))
+
+    def step_back(self) -> bool:
+        engine = self.__engine()
+        moved = self.history.step_back(engine)
+        self.__apply(engine)
+        return moved
+
+    def jump_to_step(self, step: int) -> None:
+        engine = self.__engine()
+        try:
+            self.history.jump_to(engine, step)
+        finally:
+            self.__apply(engine)
+            if engine.halted:
+                self.current_table_state = 1
+
+    def trace_engine(self) -> Engine:
+        # an engine at the current state on a copy of the tape, so a trace
+        # can be written in the background without moving the machine
+        return Engine(
+            self.compiled_table(),
+            self.tape.copy(),
+            self.current_tape_cell,
+            self.current_table_state or 1,
+        )
+
+    def forget_history(self) -> None:
+        self.history.reset(self.history.step)
+
+    def overview_image(self, update: bool = True) -> OverviewImage | None:
+        if self.overview is None:
+            return None
+        if not update:
+            return self.overview.image
+        return self.overview.update(
+            self.tape, self.current_tape_cell, self.history.step
+        )
+
+    def snapshot(
+        self, lo: int, hi: int, update_overview: bool = True
+    ) -> "MachineSnapshot":
+        tape = self.tape
+        lo, hi = max(lo, tape.lo), min(hi, tape.hi)
+        cells = tape.cells(lo, hi) if lo < hi else []
+        return MachineSnapshot(
+            self.history.step,
+            self.current_tape_cell,
+            self.current_table_state,
+            TapeWindow(tape.lo, tape.hi, lo, tuple(cells)),
+            self.overview_image(update_overview),
+        )
+
+    def save_data(self) -> dict:
+        # a copy of the tape, so saving can continue in the background
+        # while the machine keeps running
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["tape"] = self.tape.copy()
+        return data
+
+    def save_to_file(self, file_path: str, progress=None) -> None:
+        save_machine_data(file_path, self.save_data(), progress)
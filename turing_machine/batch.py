@@ -0,0 +1,134 @@
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cache import ResultCache, cached_run
+from engine import CompiledTable, Engine
+from tape import format_tape, make_tape, symbol_code
+
+
+# set once per worker process, so the table is pickled per worker rather
+# than per input tape
+_table: CompiledTable | None = None
+# built on first use of the numba backend, once per table
+_native = None
+# opened once per worker process when runs are cached
+_cache: ResultCache | None = None
+
+
+def parse_input(line: str) -> list[str]:
+    line = line.strip()
+    if " " in line:
+        return line.split()
+    return list(line)
+
+
+def read_inputs(file_path: str) -> Iterator[list[str]]:
+    with open(file_path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield parse_input(line)
+
+
+def run_input(
+    table: CompiledTable,
+    symbols: list,
+    max_steps: int,
+    head: int | None = None,
+    accelerate: bool = False,
+    backend: str = "python",
+    cache: ResultCache | None = None,
+) -> dict:
+    tape = make_tape(
+        [symbol_code(value) for value in symbols],
+        alph_value=table.alph_value,
+    )
+    if head is None:
+        head = len(symbols) - 1
+    engine = Engine(table, tape, head)
+    engine.native = _native_runner(table, backend)
+    cached_run(cache, engine, max_steps, accelerate)
+    return {
+        "input": " ".join(str(value) for value in symbols),
+        "halted": engine.halted,
+        "steps": engine.steps,
+        "head": engine.head,
+        "tape": format_tape(engine.tape),
+    }
+
+
+def _native_runner(table: CompiledTable, backend: str):
+    global _native
+    if backend == "python":
+        return None
+    from native import NativeRunner, resolve_backend
+    if resolve_backend(backend) == "python":
+        return None
+    if _native is None or _native.table is not table:
+        _native = NativeRunner(table)
+    return _native
+
+
+def _init_worker(table: CompiledTable, cache_dir: str | None) -> None:
+    global _table, _cache
+    _table = table
+    if cache_dir is not None:
+        _cache = ResultCache(cache_dir)
+
+
+def _run_chunk(
+    chunk: list,
+    max_steps: int,
+    head: int | None,
+    accelerate: bool,
+    backend: str,
+) -> list[dict]:
+    return [
+        run_input(
+            _table, symbols, max_steps, head, accelerate, backend, _cache
+        )
+        for symbols in chunk
+    ]
+
+
+def _chunks(inputs: Iterable, size: int) -> Iterator[list]:
+    inputs = iter(inputs)
+    while chunk := list(islice(inputs, size)):
+        yield chunk
+
+
+def run_many(
+    table: CompiledTable,
+    inputs: Iterable[list],
+    max_steps: int,
+    workers: int | None = None,
+    chunk_size: int = 64,
+    head: int | None = None,
+    accelerate: bool = False,
+    backend: str = "python",
+    cache_dir: str | None = None,
+) -> Iterator[dict]:
+    # workers share the cache directory; each keeps its own memory layer
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        cache = None if cache_dir is None else ResultCache(cache_dir)
+        for symbols in inputs:
+            yield run_input(
+                table, symbols, max_steps, head, accelerate, backend, cache
+            )
+        return
+
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(table, cache_dir)
+    ) as pool:
+        # keep a bounded number of chunks in flight and yield in input order
+        pending = []
+        for chunk in _chunks(inputs, chunk_size):
+            pending.append(pool.submit(
+                _run_chunk, chunk, max_steps, head, accelerate, backend
+            ))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
@@ -0,0 +1,302 @@
+import os
+import sys
+import json
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from time import perf_counter, time
+
+from engine import Engine, compile_table, engine_from_dict
+from snapshot import load_machine_data, write_json, write_snapshot
+from tape import make_tape
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAVED_STATES = os.path.join(HERE, "saved_states")
+
+# startup budgets in seconds; the core modules must also never load Qt
+IMPORT_BUDGETS = {"engine": 0.05, "app": 0.08, "cli": 0.1, "main": 0.25}
+FIRST_WINDOW_BUDGET = 0.5
+FIRST_WINDOW = """
+import sys
+from time import time
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import main
+window = main.OpenScreenGUI()
+window.show()
+app.processEvents()
+print(time())
+"""
+
+# sweeps right over its 1s, then back left, adding a cell on each side
+BOUNCER = [["0 L Q2", "N R Q1"], ["0 R Q1", "N L Q2"]]
+GROW_LEFT = [["0 L Q1", "N L Q1"]]
+GROW_RIGHT = [["0 R Q1", "N R Q1"]]
+
+
+def random_table(state_value: int, alph_value: int, seed: int = 0):
+    rnd = random.Random(seed)
+    values = ["N", "_"] + [str(i) for i in range(alph_value)]
+    return [
+        [
+            f"{rnd.choice(values)} {rnd.choice('LRS')} "
+            f"Q{rnd.randint(1, state_value)}"
+            for _ in range(alph_value + 1)
+        ]
+        for _ in range(state_value)
+    ]
+
+
+def best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def bench_steps(name, table_data, state_value, alph_value, steps, **kwargs):
+    table = compile_table(table_data, state_value, alph_value)
+    mode = kwargs.get("tape_mode", "array")
+    accelerate = kwargs.get("accelerate", False)
+    backend = kwargs.get("backend", "python")
+    if backend != "python":
+        from native import AVAILABLE
+        if not AVAILABLE:
+            return {"name": name, "skipped": f"{backend} is not installed"}
+    result = {}
+
+    def run():
+        engine = Engine(table, make_tape(bytes(30), mode), 15)
+        if backend != "python":
+            from native import use_backend
+            use_backend(engine, backend)
+        result["steps"] = engine.run(steps, accelerate)
+
+    seconds = best_of(run, kwargs.get("repeat", 3))
+    return {
+        "name": name,
+        "seconds": seconds,
+        "steps": result["steps"],
+        "steps_per_sec": result["steps"] / seconds,
+    }
+
+
+def bench_saved_states(steps: int) -> list[dict]:
+    results = []
+    for file_name in sorted(os.listdir(SAVED_STATES)):
+        file_path = os.path.join(SAVED_STATES, file_name)
+        data = load_machine_data(file_path)
+        done = {}
+
+        def run():
+            engine = engine_from_dict(data)
+            done["steps"] = engine.run(steps)
+
+        seconds = best_of(run, 3)
+        results.append({
+            "name": f"saved_states/{file_name}",
+            "seconds": seconds,
+            "steps": done["steps"],
+            "steps_per_sec": done["steps"] / seconds,
+        })
+    return results
+
+
+def bench_compile() -> dict:
+    table_data = random_table(500, 50)
+    seconds = best_of(lambda: compile_table(table_data, 500, 50), 3)
+    return {"name": "compile 500x51 table", "seconds": seconds}
+
+
+def bench_files(cells: int) -> list[dict]:
+    rnd = random.Random(0)
+    tape = make_tape(bytes(rnd.randint(0, 10) for _ in range(cells)))
+    data = {
+        "state_value": 1,
+        "alph_value": 10,
+        "current_table_state": 1,
+        "table_data": random_table(1, 10),
+        "tape": tape,
+        "current_tape_cell": 0,
+    }
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "machine.json")
+        binary_path = os.path.join(tmp, "machine.tms")
+
+        for name, func in (
+            ("save json", lambda: write_json(json_path, data)),
+            ("load json", lambda: engine_from_dict(
+                load_machine_data(json_path)
+            )),
+            ("save binary", lambda: write_snapshot(binary_path, data)),
+            ("load binary", lambda: engine_from_dict(
+                load_machine_data(binary_path)
+            )),
+        ):
+            results.append({
+                "name": f"{name} {cells} cells",
+                "seconds": best_of(func, 3),
+            })
+    return results
+
+
+def bench_scene(cells: int, frames: int) -> dict:
+    name = f"scene refresh {cells} cells"
+    try:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PyQt6.QtWidgets import QApplication
+        from tape_scene import TapeScene
+    except ImportError:
+        return {"name": name, "skipped": "PyQt6 is not installed"}
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    rnd = random.Random(0)
+    tape = make_tape(bytes(rnd.randint(0, 10) for _ in range(cells)))
+    scene = TapeScene(150)
+
+    def run():
+        for frame in range(frames):
+            head = frame % cells
+            tape[head] = rnd.randint(0, 10)
+            scene.refresh(tape, head, head - 10, head + 10)
+
+    seconds = best_of(run, 3)
+    app.processEvents()
+    return {
+        "name": name,
+        "seconds": seconds,
+        "frames_per_sec": frames / seconds,
+    }
+
+
+def bench_overview(cells: int, frames: int) -> dict:
+    # the whole tape once, then a frame after every 10000 steps of a head
+    # sweeping back and forth over a thousand cells
+    from overview import TapeOverview
+
+    rnd = random.Random(0)
+    tape = make_tape(bytes(rnd.randint(0, 10) for _ in range(cells)))
+    overview = TapeOverview(10)
+    overview.request = (1600, None, None)
+    start = perf_counter()
+    overview.update(tape, 0, 0)
+    first = perf_counter() - start
+
+    def run():
+        for frame in range(frames):
+            head = cells // 2 + frame % 1000
+            tape[head] = rnd.randint(0, 10)
+            overview.update(tape, head, (frame + 1) * 10000)
+
+    seconds = best_of(run, 3)
+    return {
+        "name": f"overview refresh {cells} cells",
+        "first_seconds": first,
+        "seconds": seconds,
+        "frames_per_sec": frames / seconds,
+    }
+
+
+def bench_import(module: str) -> dict:
+    # a fresh interpreter every time; -X importtime reports microseconds
+    # including everything the module pulls in
+    name = f"import {module}"
+    seconds = float("inf")
+    for _ in range(3):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=HERE, capture_output=True, text=True,
+        )
+        if proc.returncode:
+            return {"name": name, "skipped": proc.stderr.splitlines()[-1]}
+        modules = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            _, cumulative, imported = line.split(":", 1)[1].split("|")
+            if cumulative.strip().isdigit():
+                modules[imported.strip()] = int(cumulative)
+        seconds = min(seconds, modules[module] / 1e6)
+    return {
+        "name": name,
+        "seconds": seconds,
+        "budget": IMPORT_BUDGETS[module],
+        "loads_qt": any(imported.startswith("PyQt6") for imported in modules),
+    }
+
+
+def bench_first_window() -> dict:
+    name = "time to first window"
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    seconds = float("inf")
+    for _ in range(3):
+        start = time()
+        proc = subprocess.run(
+            [sys.executable, "-c", FIRST_WINDOW],
+            cwd=HERE, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode:
+            return {"name": name, "skipped": proc.stderr.splitlines()[-1]}
+        seconds = min(seconds, float(proc.stdout.split()[-1]) - start)
+    return {"name": name, "seconds": seconds, "budget": FIRST_WINDOW_BUDGET}
+
+
+def run_benchmarks(quick: bool = False) -> dict:
+    steps = 200_000 if quick else 2_000_000
+    cells = 100_000 if quick else 1_000_000
+    results = [
+        bench_steps("bouncer array", BOUNCER, 2, 1, steps),
+        bench_steps(
+            "bouncer sparse", BOUNCER, 2, 1, steps, tape_mode="sparse"
+        ),
+        bench_steps(
+            "bouncer accelerated", BOUNCER, 2, 1, steps, accelerate=True
+        ),
+        bench_steps("bouncer numba", BOUNCER, 2, 1, steps, backend="numba"),
+        bench_steps("random 50x10", random_table(50, 10), 50, 10, steps),
+        bench_steps(
+            "random 50x10 numba", random_table(50, 10), 50, 10, steps,
+            backend="numba",
+        ),
+        bench_steps("grow left", GROW_LEFT, 1, 1, steps),
+        bench_steps("grow right", GROW_RIGHT, 1, 1, steps),
+        *bench_saved_states(steps),
+        bench_compile(),
+        *bench_files(cells),
+        bench_scene(1000, 100 if quick else 1000),
+        bench_overview(10 * cells, 100 if quick else 1000),
+        *(bench_import(module) for module in IMPORT_BUDGETS),
+        bench_first_window(),
+    ]
+    return {
+        "timestamp": time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulator benchmarks")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run_benchmarks(args.quick), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
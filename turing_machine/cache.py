@@ -0,0 +1,213 @@
+import os
+import struct
+import hashlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from engine import CompiledTable, Engine
+from tape import MAX_ARRAY_ALPH, RLETape, Tape
+
+
+DEFAULT_DIRECTORY = os.path.join(
+    os.path.expanduser("~"), ".cache", "turing_machine"
+)
+# steps, head, state, first non-blank cell, number of cells; positions are
+# relative to the head the run started from
+RESULT = struct.Struct("<QqIqQ")
+# cells hashed at a time, so a long tape is never copied whole
+HASH_CELLS = 1 << 20
+
+
+def cacheable(table: CompiledTable) -> bool:
+    # tapes are hashed and stored a byte per cell, via Tape.packed
+    return table.alph_value <= MAX_ARRAY_ALPH
+
+
+def config_hash(
+    table: CompiledTable, tape: Tape, head: int, state: int
+):
+    # runs are translation invariant, so the tape is hashed relative to
+    # the head; only its non-blank part counts
+    first, end = tape.used()
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(struct.pack(
+        "<IIIqQ", table.state_value, table.alph_value, state,
+        first - head if end > first else 0, end - first,
+    ))
+    for column in (table.write, table.move, table.next_state):
+        digest.update(array("i", column).tobytes())
+    for lo in range(first, end, HASH_CELLS):
+        digest.update(tape.packed(lo, min(lo + HASH_CELLS, end)))
+    return digest
+
+
+def cache_key(config, max_steps: int | None) -> str:
+    # max_steps None stands for "until it halts"
+    digest = config.copy()
+    digest.update(struct.pack("<q", -1 if max_steps is None else max_steps))
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    steps: int
+    head: int
+    state: int
+    first: int
+    # the non-blank part of the tape, a byte per cell
+    cells: bytes
+
+    @classmethod
+    def from_engine(cls, engine: Engine, start_head: int, steps: int):
+        first, end = engine.tape.used()
+        return cls(
+            steps,
+            engine.head - start_head,
+            engine.state,
+            first - start_head,
+            engine.tape.packed(first, end),
+        )
+
+    def apply(self, engine: Engine) -> None:
+        start_head = engine.head
+        origin = self.first + start_head
+        if isinstance(engine.tape, RLETape):
+            tape = RLETape.from_packed(self.cells, origin)
+        else:
+            tape = type(engine.tape)(self.cells, origin)
+        engine.tape = tape
+        engine.head = start_head + self.head
+        engine.state = self.state
+        engine.steps += self.steps
+        tape.ensure(start_head)
+        tape.ensure(engine.head)
+
+    def to_bytes(self) -> bytes:
+        return RESULT.pack(
+            self.steps, self.head, self.state, self.first, len(self.cells)
+        ) + self.cells
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        steps, head, state, first, count = RESULT.unpack_from(data)
+        cells = bytes(data[RESULT.size:RESULT.size + count])
+        return cls(steps, head, state, first, cells)
+
+
+class ResultCache:
+    # an LRU of results in memory in front of a directory of result files
+    # named by key; the directory is trimmed back to max_bytes, least
+    # recently used files first
+    def __init__(
+        self,
+        directory: str | None = None,
+        memory_items: int = 1024,
+        max_bytes: int = 256 * 2**20,
+    ) -> None:
+        self.directory = directory
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self.memory: OrderedDict[str, CachedResult] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.disk_bytes = sum(
+                entry.stat().st_size for entry in os.scandir(directory)
+                if entry.is_file()
+            )
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def __remember(self, key: str, result: CachedResult) -> None:
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_items:
+            self.memory.popitem(last=False)
+
+    def get(self, key: str) -> CachedResult | None:
+        result = self.memory.get(key)
+        if result is not None:
+            self.memory.move_to_end(key)
+        elif self.directory is not None:
+            try:
+                with open(self.__path(key), "rb") as f:
+                    result = CachedResult.from_bytes(f.read())
+                # the file's mtime is its place in the disk LRU
+                os.utime(self.__path(key))
+            except (OSError, struct.error):
+                result = None
+            if result is not None:
+                self.__remember(key, result)
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        self.__remember(key, result)
+        if self.directory is None:
+            return
+        data = result.to_bytes()
+        if len(data) > self.max_bytes:
+            return
+        # written under a temporary name and renamed, so other processes
+        # sharing the directory never read half a file
+        path = self.__path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self.disk_bytes += len(data)
+        if self.disk_bytes > self.max_bytes:
+            self.__evict()
+
+    def __evict(self) -> None:
+        entries = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        self.disk_bytes = sum(entry.stat().st_size for entry in entries)
+        # trim to 3/4 of the limit, so eviction doesn't run on every put
+        for entry in entries:
+            if self.disk_bytes <= self.max_bytes * 3 // 4:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.disk_bytes -= size
+
+
+def cached_run(
+    cache: ResultCache | None,
+    engine: Engine,
+    max_steps: int,
+    accelerate: bool = False,
+) -> int:
+    # a run that halted is stored once without a step limit and answers
+    # every limit it fits in; other runs only match their exact limit
+    if cache is None or engine.halted or not cacheable(engine.table):
+        return engine.run(max_steps, accelerate)
+    config = config_hash(engine.table, engine.tape, engine.head, engine.state)
+    halt_key = cache_key(config, None)
+    result = cache.get(halt_key)
+    if result is None or result.steps > max_steps:
+        limit_key = cache_key(config, max_steps)
+        result = cache.get(limit_key)
+    if result is not None:
+        cache.hits += 1
+        result.apply(engine)
+        return result.steps
+    cache.misses += 1
+    start_head = engine.head
+    done = engine.run(max_steps, accelerate)
+    cache.put(
+        halt_key if engine.halted else limit_key,
+        CachedResult.from_engine(engine, start_head, done),
+    )
+    return done
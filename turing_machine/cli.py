@@ -0,0 +1,269 @@
+import sys
+import json
+import argparse
+from time import perf_counter
+
+from batch import read_inputs, run_many
+from cache import DEFAULT_DIRECTORY, ResultCache, cached_run
+from engine import Engine, compile_table, engine_from_dict
+from loops import LoopDetector
+from optimize import optimize
+from profiling import Profile
+from snapshot import load_machine_data
+from tape import TAPE_MODES, format_tape
+from tracing import TraceWriter, trace_chunks
+
+
+CHUNK_STEPS = 100000
+
+
+def run_engine(
+    engine: Engine,
+    max_steps: int,
+    time_limit: float | None = None,
+    accelerate: bool = False,
+    detect_loops: bool = False,
+    trace: TraceWriter | None = None,
+    cache: ResultCache | None = None,
+) -> str:
+    if cache is not None:
+        cached_run(cache, engine, max_steps - engine.steps, accelerate)
+        return "halted" if engine.halted else "step limit"
+    detector = LoopDetector(engine) if detect_loops else None
+    start = perf_counter()
+    while not engine.halted and engine.steps < max_steps:
+        chunk = min(CHUNK_STEPS, max_steps - engine.steps)
+        if detector is not None:
+            detector.run(chunk)
+            if detector.loop is not None:
+                return f"loop (period {detector.loop.period})"
+        elif trace is not None:
+            for trace_chunk in trace_chunks(engine, chunk):
+                trace.write(trace_chunk)
+        else:
+            engine.run(chunk, accelerate)
+        if time_limit is not None and perf_counter() - start >= time_limit:
+            break
+    if engine.halted:
+        return "halted"
+    if engine.steps >= max_steps:
+        return "step limit"
+    return "time limit"
+
+
+def run_file(file_path: str, args: argparse.Namespace) -> dict:
+    data = load_machine_data(file_path)
+    engine = engine_from_dict(data, args.tape_mode)
+    if args.optimize:
+        optimization = optimize(engine.table, (1, engine.state))
+        engine.table = optimization.table
+        engine.state = optimization.states[engine.state]
+    if args.profile:
+        engine.profile = Profile(engine.table, args.profile_bucket)
+    if args.backend != "python":
+        from native import use_backend
+        use_backend(engine, args.backend)
+    trace = TraceWriter(args.trace) if args.trace else None
+    cache = ResultCache(args.cache) if args.cache else None
+    start = perf_counter()
+    try:
+        status = run_engine(
+            engine,
+            args.max_steps,
+            args.time_limit,
+            args.accelerate,
+            args.detect_loops,
+            trace,
+            cache,
+        )
+    finally:
+        if trace is not None:
+            trace.close()
+    elapsed = perf_counter() - start
+    result = {
+        "file": file_path,
+        "status": status,
+        "steps": engine.steps,
+        "head": engine.head,
+        "state": engine.state,
+        "tape": format_tape(engine.tape),
+        "seconds": elapsed,
+        "steps_per_sec": engine.steps / elapsed if elapsed else 0.0,
+    }
+    if engine.profile is not None:
+        result["profile"] = engine.profile.report()
+    return result
+
+
+def run_inputs(file_path: str, args: argparse.Namespace) -> None:
+    data = load_machine_data(file_path)
+    table = compile_table(
+        data["table_data"], data["state_value"], data["alph_value"]
+    )
+    head = 0 if args.input_head == "start" else None
+    if args.vectorized:
+        from vectorized import run_many_vectorized
+        results = run_many_vectorized(
+            table, read_inputs(args.inputs), args.max_steps, head
+        )
+    else:
+        results = run_many(
+            table,
+            read_inputs(args.inputs),
+            args.max_steps,
+            workers=args.workers,
+            head=head,
+            accelerate=args.accelerate,
+            backend=args.backend,
+            cache_dir=args.cache,
+        )
+    for result in results:
+        result["file"] = file_path
+        if args.json:
+            print(json.dumps(result))
+        else:
+            status = "halted" if result["halted"] else "step limit"
+            print(
+                f"{result['input']} -> {result['tape']} "
+                f"({status}, {result['steps']} steps)"
+            )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run saved Turing machines without the GUI"
+    )
+    parser.add_argument("files", nargs="+", help="machine JSON files")
+    parser.add_argument("--max-steps", type=int, default=10_000_000)
+    parser.add_argument(
+        "--time-limit", type=float, default=None,
+        help="seconds per machine",
+    )
+    parser.add_argument(
+        "--tape-mode", choices=sorted(TAPE_MODES), default=None
+    )
+    parser.add_argument(
+        "--accelerate", action="store_true",
+        help="skip over repeated head sweeps",
+    )
+    parser.add_argument(
+        "--optimize", action="store_true",
+        help="drop unreachable and merge equivalent states before running",
+    )
+    parser.add_argument(
+        "--detect-loops", action="store_true",
+        help="stop when a configuration repeats exactly",
+    )
+    parser.add_argument(
+        "--profile",
+        help="write per-transition counts and head histograms to this file",
+    )
+    parser.add_argument(
+        "--profile-bucket", type=int, default=1,
+        help="cells per head histogram bucket",
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print results as JSON lines"
+    )
+    parser.add_argument(
+        "--inputs",
+        help="file with one input tape per line, run against each machine",
+    )
+    parser.add_argument(
+        "--input-head", choices=["start", "end"], default="end",
+        help="head position on each input tape",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="worker processes for --inputs (default: CPU count)",
+    )
+    parser.add_argument(
+        "--vectorized", action="store_true",
+        help="run --inputs in lockstep with NumPy (requires numpy)",
+    )
+    parser.add_argument(
+        "--backend", choices=["python", "numba"], default="python",
+        help="step loop implementation (numba falls back to python "
+        "when it isn't installed)",
+    )
+    parser.add_argument(
+        "--trace",
+        help="write every step to this file (.tmt for binary chunks, "
+        "newline-delimited JSON otherwise)",
+    )
+    parser.add_argument(
+        "--cache", nargs="?", const=DEFAULT_DIRECTORY, default=None,
+        metavar="DIR",
+        help="reuse results of runs seen before, keyed by table, tape and "
+        f"step limit (default directory: {DEFAULT_DIRECTORY})",
+    )
+    args = parser.parse_args(argv)
+    if args.cache and (
+        args.trace or args.profile or args.detect_loops or args.time_limit
+    ):
+        parser.error(
+            "--cache can't be combined with --trace/--profile/"
+            "--detect-loops/--time-limit"
+        )
+    if args.cache and args.vectorized:
+        parser.error("--cache can't be combined with --vectorized")
+    if args.trace and (args.detect_loops or args.profile):
+        parser.error("--trace can't be combined with --detect-loops/--profile")
+    if args.trace and (len(args.files) > 1 or args.inputs):
+        parser.error("--trace takes a single machine file and no --inputs")
+    # input tapes run through batch.run_many, which has no use for these
+    if args.inputs and (
+        args.time_limit is not None or args.detect_loops or args.optimize
+        or args.tape_mode or args.profile
+    ):
+        parser.error(
+            "--inputs can't be combined with --time-limit/--detect-loops/"
+            "--optimize/--tape-mode/--profile"
+        )
+    if args.vectorized and (args.accelerate or args.backend != "python"):
+        parser.error(
+            "--vectorized can't be combined with --accelerate/--backend"
+        )
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.backend == "numba":
+        from native import AVAILABLE
+        if not AVAILABLE:
+            print("numba is not installed, using python", file=sys.stderr)
+            args.backend = "python"
+    exit_code = 0
+    reports = []
+    for file_path in args.files:
+        try:
+            if args.inputs:
+                run_inputs(file_path, args)
+                continue
+            result = run_file(file_path, args)
+        except (OSError, ValueError, KeyError, ImportError) as e:
+            print(f"{file_path}: {e}", file=sys.stderr)
+            exit_code = 1
+            continue
+        if "profile" in result:
+            reports.append(
+                {"file": file_path, **result.pop("profile")}
+            )
+        if args.json:
+            print(json.dumps(result))
+        else:
+            print(
+                f"{result['file']}: {result['status']} after "
+                f"{result['steps']} steps, head {result['head']}, "
+                f"{result['steps_per_sec']:.0f} steps/s\n"
+                f"  tape: {result['tape']}"
+            )
+    if args.profile:
+        with open(args.profile, "w") as f:
+            json.dump(reports, f, indent=2)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
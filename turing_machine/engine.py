@@ -0,0 +1,311 @@
+from dataclasses import dataclass
+from functools import cached_property
+
+from tape import BLANK, ArrayTape, Tape, make_tape, symbol_code
+
+
+MOVES = {"L": -1, "S": 0, "R": 1}
+MOVE_NAMES = {step: name for name, step in MOVES.items()}
+KEEP = -1
+HALT = 0
+
+
+def compile_command(
+    command: str, state_value: int, alph_value: int
+) -> tuple[int, int, int]:
+    try:
+        raw_val, raw_move, raw_next = command.split(" ")
+    except ValueError:
+        raise ValueError("Wrong number of arguments")
+
+    if raw_val == "N":
+        val = KEEP
+    elif raw_val == "_":
+        val = BLANK
+    elif raw_val.isdigit() and int(raw_val) < alph_value:
+        val = int(raw_val) + 1
+    else:
+        raise ValueError(f"Wrong new value {raw_val}")
+
+    if raw_move not in MOVES:
+        raise ValueError(f"Wrong move value {raw_move}")
+
+    if (
+        raw_next[:1] != "Q"
+        or not raw_next[1:].isdigit()
+        or int(raw_next[1:]) > state_value
+    ):
+        raise ValueError(f"Wrong next step value {raw_next}")
+
+    return val, MOVES[raw_move], int(raw_next[1:])
+
+
+@dataclass(frozen=True)
+class CompiledTable:
+    state_value: int
+    alph_value: int
+    write: tuple[int, ...]
+    move: tuple[int, ...]
+    next_state: tuple[int, ...]
+
+    @property
+    def width(self) -> int:
+        return self.alph_value + 1
+
+    def index(self, state: int, code: int) -> int:
+        return (state - 1) * self.width + code
+
+    @cached_property
+    def sweeps(self) -> tuple[bool, ...]:
+        # cells that keep the state and move the head: the machine repeats
+        # them for as long as it keeps reading the same symbol
+        return tuple(
+            self.next_state[inx] == inx // self.width + 1
+            and self.move[inx] != 0
+            for inx in range(len(self.next_state))
+        )
+
+
+def cell_name(row: int, col: int) -> str:
+    col_msg = str(col - 1) if col > 0 else "_"
+    return f"{col_msg}-Q{row + 1}"
+
+
+class TableBuilder:
+    # keeps compiled entries and errors per cell, so editing one cell of
+    # the GUI table re-parses only that cell
+    def __init__(
+        self, table_data: list[list[str]], state_value: int, alph_value: int
+    ) -> None:
+        self.state_value = state_value
+        self.alph_value = alph_value
+        size = state_value * (alph_value + 1)
+        self.write = [KEEP] * size
+        self.move = [0] * size
+        self.next_state = [HALT] * size
+        self.errors: dict[tuple[int, int], str] = {}
+        self.table: CompiledTable | None = None
+        for row in range(state_value):
+            row_data = table_data[row] if row < len(table_data) else []
+            for col in range(alph_value + 1):
+                command = row_data[col] if col < len(row_data) else ""
+                self.set_cell(row, col, command)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def set_cell(self, row: int, col: int, command: str) -> str | None:
+        inx = row * (self.alph_value + 1) + col
+        try:
+            val, step, next = compile_command(
+                command, self.state_value, self.alph_value
+            )
+        except ValueError as e:
+            error = f"{e}, cell {cell_name(row, col)}"
+            self.errors[row, col] = error
+            self.table = None
+            return error
+        self.errors.pop((row, col), None)
+        if (val, step, next) != (
+            self.write[inx], self.move[inx], self.next_state[inx]
+        ) or self.table is None:
+            self.write[inx] = val
+            self.move[inx] = step
+            self.next_state[inx] = next
+            self.table = None
+        return None
+
+    def error_messages(self) -> list[str]:
+        return [self.errors[key] for key in sorted(self.errors)]
+
+    def compiled(self) -> CompiledTable:
+        if self.errors:
+            raise ValueError("\n".join(self.error_messages()))
+        if self.table is None:
+            self.table = CompiledTable(
+                self.state_value,
+                self.alph_value,
+                tuple(self.write),
+                tuple(self.move),
+                tuple(self.next_state),
+            )
+        return self.table
+
+
+def compile_table(
+    table_data: list[list[str]], state_value: int, alph_value: int
+) -> CompiledTable:
+    return TableBuilder(table_data, state_value, alph_value).compiled()
+
+
+def sweep_length(
+    buffer: bytearray, inx: int, step: int, code: int, limit: int
+) -> int:
+    # length of the run of `code` cells starting at inx in direction step,
+    # stopping short of the buffer's margin cell; scanned in growing windows
+    # so a short run doesn't copy the rest of the tape
+    if step > 0:
+        avail = min(len(buffer) - 1 - inx, limit)
+    else:
+        avail = min(inx, limit)
+    pattern = bytes((code,))
+    count = 0
+    window = 64
+    while count < avail:
+        size = min(window, avail - count)
+        if step > 0:
+            segment = buffer[inx + count:inx + count + size]
+            rest = len(segment.lstrip(pattern))
+        else:
+            segment = buffer[inx - count - size + 1:inx - count + 1]
+            rest = len(segment.rstrip(pattern))
+        count += size - rest
+        if rest:
+            break
+        window *= 2
+    return count
+
+
+class Engine:
+    def __init__(
+        self,
+        table: CompiledTable,
+        tape: Tape,
+        head: int,
+        state: int = 1,
+    ) -> None:
+        self.table = table
+        self.tape = tape
+        self.head = head
+        self.state = state
+        self.steps = 0
+        self.profile = None
+        self.native = None
+        self.tape.ensure(head)
+
+    @property
+    def halted(self) -> bool:
+        return self.state == HALT
+
+    def step(self) -> bool:
+        return self.run(1) == 1 and not self.halted
+
+    def run(self, max_steps: int, accelerate: bool = False) -> int:
+        if self.profile is not None:
+            done = self.profile.run(self, max_steps)
+        elif self.native is not None and isinstance(self.tape, ArrayTape):
+            done = self.native.run(self, max_steps)
+        elif isinstance(self.tape, ArrayTape):
+            if accelerate:
+                done = self.__run_array_accelerated(max_steps)
+            else:
+                done = self.__run_array(max_steps)
+        else:
+            done = self.__run_generic(max_steps)
+        self.steps += done
+        return done
+
+    def __run_array(self, max_steps: int) -> int:
+        table = self.table
+        write, move, next_state = table.write, table.move, table.next_state
+        width = table.width
+        tape = self.tape
+        buffer, offset = tape.buffer, tape.offset
+        size = len(buffer)
+        inx = self.head + offset
+        state = self.state
+        done = 0
+        while done < max_steps and state != HALT:
+            cell = (state - 1) * width + buffer[inx]
+            val = write[cell]
+            if val != KEEP:
+                buffer[inx] = val
+            inx += move[cell]
+            state = next_state[cell]
+            done += 1
+            if inx <= 0 or inx + 1 >= size:
+                pos = inx - offset
+                tape.ensure(pos)
+                buffer, offset = tape.buffer, tape.offset
+                size = len(buffer)
+                inx = pos + offset
+        self.head = inx - offset
+        self.state = state
+        return done
+
+    def __run_array_accelerated(self, max_steps: int) -> int:
+        table = self.table
+        write, move, next_state = table.write, table.move, table.next_state
+        sweeps = table.sweeps
+        width = table.width
+        tape = self.tape
+        buffer, offset = tape.buffer, tape.offset
+        size = len(buffer)
+        inx = self.head + offset
+        state = self.state
+        done = 0
+        while done < max_steps and state != HALT:
+            code = buffer[inx]
+            cell = (state - 1) * width + code
+            val = write[cell]
+            step = move[cell]
+            if sweeps[cell]:
+                count = sweep_length(buffer, inx, step, code, max_steps - done)
+                if val != KEEP and val != code:
+                    start = inx if step > 0 else inx - count + 1
+                    buffer[start:start + count] = bytes((val,)) * count
+                inx += step * count
+                done += count
+            else:
+                if val != KEEP:
+                    buffer[inx] = val
+                inx += step
+                state = next_state[cell]
+                done += 1
+            if inx <= 0 or inx + 1 >= size:
+                pos = inx - offset
+                tape.ensure(pos)
+                buffer, offset = tape.buffer, tape.offset
+                size = len(buffer)
+                inx = pos + offset
+        self.head = inx - offset
+        self.state = state
+        return done
+
+    def __run_generic(self, max_steps: int) -> int:
+        table = self.table
+        write, move, next_state = table.write, table.move, table.next_state
+        width = table.width
+        tape = self.tape
+        head = self.head
+        state = self.state
+        done = 0
+        while done < max_steps and state != HALT:
+            cell = (state - 1) * width + tape[head]
+            val = write[cell]
+            if val != KEEP:
+                tape[head] = val
+            head += move[cell]
+            state = next_state[cell]
+            done += 1
+            tape.ensure(head)
+        self.head = head
+        self.state = state
+        return done
+
+
+def engine_from_dict(data: dict, tape_mode: str | None = None) -> Engine:
+    table = compile_table(
+        data["table_data"], data["state_value"], data["alph_value"]
+    )
+    tape = data["tape"]
+    if not isinstance(tape, Tape):
+        tape = make_tape(
+            [symbol_code(value) for value in tape],
+            tape_mode or data.get("tape_mode", "array"),
+            alph_value=data["alph_value"],
+        )
+    # a saved halted machine (Q0) restarts from Q1, as in the GUI
+    state = data.get("current_table_state") or 1
+    return Engine(table, tape, data["current_tape_cell"], state)
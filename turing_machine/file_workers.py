@@ -0,0 +1,73 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from engine import Engine
+from snapshot import load_machine, save_machine_data
+from tracing import write_trace
+
+
+class LoadWorker(QThread):
+    # reads and decodes a saved machine off the GUI thread; the caller
+    # builds the TuringMachineApp from the emitted dict
+    progress = pyqtSignal(int)
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path: str, parent=None) -> None:
+        super().__init__(parent)
+        self.file_path = file_path
+
+    def run(self) -> None:
+        try:
+            data = load_machine(self.file_path, self.progress.emit)
+        except (OSError, ValueError, KeyError) as e:
+            self.failed.emit(f"Could not load {self.file_path}: {e}")
+            return
+        self.loaded.emit(data)
+
+
+class SaveWorker(QThread):
+    # writes a machine taken with TuringMachineApp.save_data, so the tape
+    # it streams out can't change underneath it
+    progress = pyqtSignal(int)
+    saved = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path: str, data: dict, parent=None) -> None:
+        super().__init__(parent)
+        self.file_path = file_path
+        self.data = data
+
+    def run(self) -> None:
+        try:
+            save_machine_data(self.file_path, self.data, self.progress.emit)
+        except (OSError, ValueError) as e:
+            self.failed.emit(f"Could not save {self.file_path}: {e}")
+            return
+        self.saved.emit(self.file_path)
+
+
+class TraceWorker(QThread):
+    # writes the trace of a run from TuringMachineApp.trace_engine, which
+    # works on its own copy of the tape
+    progress = pyqtSignal(int)
+    traced = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    def __init__(
+        self, file_path: str, engine: Engine, max_steps: int, parent=None
+    ) -> None:
+        super().__init__(parent)
+        self.file_path = file_path
+        self.engine = engine
+        self.max_steps = max_steps
+
+    def run(self) -> None:
+        try:
+            records = write_trace(
+                self.file_path, self.engine, self.max_steps,
+                progress=self.progress.emit,
+            )
+        except (OSError, ValueError) as e:
+            self.failed.emit(f"Could not trace to {self.file_path}: {e}")
+            return
+        self.traced.emit(records)
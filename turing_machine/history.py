@@ -0,0 +1,184 @@
+from array import array
+from dataclasses import dataclass
+
+from engine import HALT, KEEP, CompiledTable, Engine
+from tape import Tape
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    step: int
+    tape: Tape
+    head: int
+    state: int
+
+    @property
+    def nbytes(self) -> int:
+        return self.tape.nbytes + 64
+
+
+class History:
+    # periodic full checkpoints plus one (head, old symbol, old state)
+    # delta per step since the last checkpoint; the write position of a
+    # step is always its old head. Batches run at full speed record no
+    # deltas and checkpoint only once the steps since the last checkpoint
+    # outnumber the tape's bytes, so copies stay a small share of the run;
+    # stepping back into them replays from the last checkpoint
+    DELTA_BYTES = 8 + 2 + 4
+
+    def __init__(
+        self, checkpoint_every: int = 10000, max_bytes: int = 64 * 2**20
+    ) -> None:
+        self.checkpoint_every = checkpoint_every
+        self.max_bytes = max_bytes
+        self.table: CompiledTable | None = None
+        self.step = 0
+        self.checkpoints: list[Checkpoint] = []
+        self.heads = array("q")
+        self.codes = array("H")
+        self.states = array("I")
+
+    @property
+    def first_step(self) -> int:
+        return self.checkpoints[0].step if self.checkpoints else self.step
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            sum(checkpoint.nbytes for checkpoint in self.checkpoints)
+            + len(self.heads) * self.DELTA_BYTES
+        )
+
+    @property
+    def recorded(self) -> bool:
+        # every step since the last checkpoint has its delta
+        return bool(self.checkpoints) and (
+            self.checkpoints[-1].step + len(self.heads) == self.step
+        )
+
+    def reset(self, step: int = 0) -> None:
+        self.table = None
+        self.step = step
+        self.checkpoints.clear()
+        del self.heads[:], self.codes[:], self.states[:]
+
+    def __use_table(self, engine: Engine) -> None:
+        if engine.table is not self.table:
+            self.reset(self.step)
+            self.table = engine.table
+
+    def __checkpoint(self, engine: Engine) -> None:
+        self.checkpoints.append(Checkpoint(
+            self.step, engine.tape.copy(), engine.head, engine.state
+        ))
+        del self.heads[:], self.codes[:], self.states[:]
+        while self.nbytes > self.max_bytes and len(self.checkpoints) > 1:
+            del self.checkpoints[0]
+
+    def __restore(self, engine: Engine, target: int) -> None:
+        # back to the last checkpoint at or before target
+        while self.checkpoints[-1].step > target:
+            self.checkpoints.pop()
+        checkpoint = self.checkpoints[-1]
+        engine.tape = checkpoint.tape.copy()
+        engine.head = checkpoint.head
+        engine.state = checkpoint.state
+        del self.heads[:], self.codes[:], self.states[:]
+        self.step = checkpoint.step
+
+    def run(self, engine: Engine, max_steps: int) -> int:
+        # step by step, recording a delta per step
+        self.__use_table(engine)
+        if not self.recorded:
+            self.__checkpoint(engine)
+        table = engine.table
+        write, move, next_state = table.write, table.move, table.next_state
+        width = table.width
+        tape = engine.tape
+        heads, codes, states = self.heads, self.codes, self.states
+        head = engine.head
+        state = engine.state
+        next_checkpoint = self.checkpoints[-1].step + self.checkpoint_every
+        done = 0
+        while done < max_steps and state != HALT:
+            if self.step == next_checkpoint:
+                engine.head, engine.state = head, state
+                self.__checkpoint(engine)
+                next_checkpoint = self.step + self.checkpoint_every
+            code = tape[head]
+            heads.append(head)
+            codes.append(code)
+            states.append(state)
+            cell = (state - 1) * width + code
+            val = write[cell]
+            if val != KEEP:
+                tape[head] = val
+            head += move[cell]
+            state = next_state[cell]
+            tape.ensure(head)
+            self.step += 1
+            done += 1
+        engine.head = head
+        engine.state = state
+        engine.steps += done
+        return done
+
+    def run_batch(
+        self, engine: Engine, max_steps: int, accelerate: bool = False
+    ) -> int:
+        # the engine's own loop, checkpointing first if the last
+        # checkpoint is far enough behind
+        self.__use_table(engine)
+        if not self.checkpoints or self.step - self.checkpoints[-1].step >= (
+            max(self.checkpoint_every, engine.tape.nbytes)
+        ):
+            self.__checkpoint(engine)
+        done = engine.run(max_steps, accelerate)
+        if done:
+            # deltas since the checkpoint no longer lead up to the step
+            del self.heads[:], self.codes[:], self.states[:]
+        self.step += done
+        return done
+
+    def __replay(self, engine: Engine, target: int) -> None:
+        # from the last checkpoint before target with the table the
+        # history was made with; at full speed up to a fresh checkpoint
+        # near target, then recording deltas so further steps back are
+        # cheap
+        self.__restore(engine, target)
+        table, engine.table = engine.table, self.table
+        try:
+            start = target - self.checkpoint_every
+            if start > self.step:
+                self.step += engine.run(start - self.step)
+                self.__checkpoint(engine)
+            self.run(engine, target - self.step)
+        finally:
+            engine.table = table
+
+    def step_back(self, engine: Engine) -> bool:
+        if self.step <= self.first_step:
+            return False
+        if not self.recorded or not self.heads:
+            self.__replay(engine, self.step - 1)
+            return True
+        head = self.heads.pop()
+        engine.tape[head] = self.codes.pop()
+        engine.head = head
+        engine.state = self.states.pop()
+        self.step -= 1
+        return True
+
+    def jump_to(self, engine: Engine, target: int) -> None:
+        if target < self.first_step:
+            raise ValueError(
+                f"Step {target} is no longer in history, "
+                f"earliest is {self.first_step}"
+            )
+        if target >= self.step:
+            self.run_batch(engine, target - self.step)
+        elif self.recorded and target >= self.checkpoints[-1].step:
+            while self.step > target:
+                self.step_back(engine)
+        else:
+            self.__replay(engine, target)
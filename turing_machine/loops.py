@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+
+from engine import HALT, KEEP, Engine
+from tape import Tape
+
+
+# polynomial tape hash sum(code * BASE ** pos) mod a Mersenne prime; blank
+# cells contribute nothing, so growing the tape never changes the hash
+MODULUS = (1 << 61) - 1
+BASE = 1_000_003
+INVERSE = pow(BASE, MODULUS - 2, MODULUS)
+
+
+def position_power(pos: int) -> int:
+    if pos >= 0:
+        return pow(BASE, pos, MODULUS)
+    return pow(INVERSE, -pos, MODULUS)
+
+
+def tape_hash(tape: Tape) -> int:
+    value = 0
+    power = position_power(tape.lo)
+    for code in tape.to_list():
+        value = (value + code * power) % MODULUS
+        power = power * BASE % MODULUS
+    return value
+
+
+def tape_contents(tape: Tape) -> tuple[int, tuple[int, ...]]:
+    cells = tape.to_list()
+    used = [inx for inx, code in enumerate(cells) if code]
+    if not used:
+        return 0, ()
+    return tape.lo + used[0], tuple(cells[used[0]:used[-1] + 1])
+
+
+@dataclass(frozen=True)
+class Loop:
+    period: int
+    detected_at: int
+
+
+class LoopDetector:
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.hash = tape_hash(engine.tape)
+        self.power = position_power(engine.head)
+        self.loop: Loop | None = None
+        # Brent's algorithm: a single checkpoint, replaced whenever the
+        # distance to it reaches the next power of two
+        self.checkpoint = None
+        self.contents = None
+        self.distance = 0
+        self.limit = 1
+        self.__save_checkpoint()
+
+    def __config(self) -> tuple[int, int, int]:
+        return self.engine.state, self.engine.head, self.hash
+
+    def __save_checkpoint(self) -> None:
+        # the tape copy happens at power-of-two distances only, so its cost
+        # is amortized over the steps in between
+        self.checkpoint = self.__config()
+        self.contents = tape_contents(self.engine.tape)
+        self.distance = 0
+
+    def __is_repeat(self) -> bool:
+        # a hash match is only reported once the tapes compare equal
+        return tape_contents(self.engine.tape) == self.contents
+
+    def run(self, max_steps: int) -> int:
+        engine = self.engine
+        table = engine.table
+        write, move, next_state = table.write, table.move, table.next_state
+        width = table.width
+        tape = engine.tape
+        done = 0
+        while done < max_steps and engine.state != HALT and not self.loop:
+            head = engine.head
+            code = tape[head]
+            cell = (engine.state - 1) * width + code
+            val = write[cell]
+            if val != KEEP and val != code:
+                tape[head] = val
+                self.hash = (self.hash + (val - code) * self.power) % MODULUS
+            step = move[cell]
+            if step > 0:
+                self.power = self.power * BASE % MODULUS
+            elif step < 0:
+                self.power = self.power * INVERSE % MODULUS
+            engine.head = head + step
+            tape.ensure(engine.head)
+            engine.state = next_state[cell]
+            engine.steps += 1
+            done += 1
+
+            self.distance += 1
+            if self.__config() == self.checkpoint and self.__is_repeat():
+                self.loop = Loop(self.distance, engine.steps)
+            elif self.distance == self.limit:
+                self.limit *= 2
+                self.__save_checkpoint()
+        return done
@@ -1,82 +1,43 @@
 import sys
-import json
-from time import sleep
-from dataclasses import dataclass, asdict, field
+from math import ceil, floor
+from time import perf_counter, sleep
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
-    QGraphicsScene,
-    QGraphicsTextItem,
-    QGraphicsRectItem,
-    QTableWidgetItem,
     QMessageBox,
     QFileDialog,
+    QInputDialog,
 )
 from PyQt6.QtCore import (
-    Qt, QRectF, QThread, QMutex, QMutexLocker, pyqtSignal
+    QThread, QTimer, pyqtSignal
 )
-from PyQt6.QtGui import QFont
 
 from machine_ui import Ui_MainWindow
+from app import MachineSnapshot, TuringMachineApp
+from engine import CompiledTable
+from tape import BLANK, symbol_code
+from tape_scene import TapeScene
+from table_model import TransitionTableModel
+from snapshot import FILE_FILTER
+from tracing import FILE_FILTER as TRACE_FILE_FILTER
+from file_workers import LoadWorker, SaveWorker, TraceWorker
+from cache import DEFAULT_DIRECTORY, ResultCache
+from overview import TapeOverview
 
 
-@dataclass
-class TuringMachineApp:
-    state_value: int
-    alph_value: int
-    is_ready_to_start: bool = True
-    is_on: bool = False
-    current_table_state: int = 1
-    table_data: list[list[str]] = field(default_factory=list)
-    tape: list[str] = field(default_factory=lambda: ["_"] * 30)
-    current_tape_cell: int = 15
-    mutex = QMutex()
-
-    def __parse_command(self, command: str) -> tuple[str, int, int]:
-        move_list = {"L": -1, "S": 0, "R": 1}
-        raw_val, raw_move, raw_next = command.split(" ")
-        val = self.tape[self.current_tape_cell] if raw_val == "N" else raw_val
-        move = move_list[raw_move]
-        next = int(raw_next[1:])
-        return val, move, next
-
-    def __update_machine_state(self, val: str, move: int, next: int) -> None:
-        self.tape[self.current_tape_cell] = val
-        self.current_tape_cell += move
-        self.check_tape_expantion()
-        self.current_table_state = next
-
-    def check_tape_expantion(self) -> None:
-        if self.current_tape_cell + 1 >= len(self.tape):
-            self.tape.extend(["_"] * 10)
-        elif self.current_tape_cell <= 0:
-            self.tape = ["_"] * 10 + self.tape
-            self.current_tape_cell += 10
-        else:
-            return
-
-    def single_step(self) -> bool:
-        with QMutexLocker(self.mutex):
-            current_tape_cell_val = self.tape[self.current_tape_cell]
-            if current_tape_cell_val == "_":
-                columns_inx = 0
-            else:
-                columns_inx = int(current_tape_cell_val) + 1
-
-            command = self.\
-                table_data[self.current_table_state - 1][columns_inx]
+REFRESH_RATE = 60
+MAX_SHOWN_ERRORS = 20
+# suggested length of a trace written from the GUI
+TRACE_STEPS = 100_000
 
-            val, move, next = self.__parse_command(command)
-            self.__update_machine_state(val, move, next)
-            if next == 0:
-                self.current_table_state = 1
-                return False
-            return True
 
-    def save_to_file(self, file_path: str) -> None:
-        with open(file_path, "w") as f:
-            data = json.dumps(asdict(self))
-            f.writelines(data)
+def open_result_cache() -> ResultCache:
+    # runs to halt are shared with the CLI through the disk cache; if it
+    # can't be created, results are still kept for this session
+    try:
+        return ResultCache(DEFAULT_DIRECTORY)
+    except OSError:
+        return ResultCache()
 
 
 class TuringMachineGUI(QMainWindow):
@@ -89,28 +50,47 @@ class TuringMachineGUI(QMainWindow):
         self.cell_size = 150
 
         self.machine = machine
+        self.result_cache = open_result_cache()
         self.worker = Worker(self.machine)
+        self.file_worker: QThread | None = None
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(1000 // REFRESH_RATE)
 
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
+        self.table_model = TransitionTableModel(self.machine, self)
+        self.ui.table_view.setModel(self.table_model)
         self.create_ui()
-
-        # Adding Parsed Tables
-        self.parse_table_values()
+        self.tape_scene = TapeScene(self.cell_size, self)
+        self.ui.graphics_view.setScene(self.tape_scene)
 
         # connect
         self.ui.set_empty_btn.clicked.connect(self.set_empty_value)
         self.ui.cell_val_btn.clicked.connect(self.set_cell_value)
-        self.ui.table_widget.cellChanged.connect(self.parse_table_values)
         self.ui.one_step_btn.clicked.connect(self.exec_single_step)
+        self.ui.step_back_btn.clicked.connect(self.exec_step_back)
+        self.ui.jump_btn.clicked.connect(self.exec_jump)
         self.ui.many_steps_btn.clicked.connect(self.exec_many_steps)
         self.ui.stop_btn.clicked.connect(self.stop_exec)
         self.ui.save_state_btn.clicked.connect(self.save_state)
         self.ui.load_state_btn.clicked.connect(self.load_state)
+        self.ui.trace_btn.clicked.connect(self.export_trace)
         self.ui.new_machine_btn.clicked.connect(self.open_requested.emit)
+        self.ui.heatmap_box.toggled.connect(self.toggle_heatmap)
+        self.ui.native_box.toggled.connect(self.toggle_native)
+        self.ui.accelerate_box.toggled.connect(self.toggle_accelerate)
 
         self.worker.signal.connect(self.update_tape_graphics)
-        self.worker.btn_signal.connect(self.__release_buttons_after_loop)
+        self.worker.finished.connect(self.__worker_finished)
+        self.worker.failed.connect(
+            lambda message: QMessageBox.critical(self, "Fail", message)
+        )
+        self.frame_timer.timeout.connect(self.update_tape_graphics)
+        self.ui.graphics_view.horizontalScrollBar().valueChanged.connect(
+            self.update_tape_graphics
+        )
+        self.ui.overview.navigate.connect(self.scroll_to_cell)
+        self.ui.overview.zoomed.connect(self.update_tape_graphics)
 
         # draw tape
         self.update_tape_graphics()
@@ -118,245 +98,388 @@ class TuringMachineGUI(QMainWindow):
         self.ui.graphics_view.mousePressEvent = self.on_mouse_clicked
 
     def create_ui(self) -> None:
-        self.ui.table_widget.setColumnCount(self.machine.alph_value + 1)
-        self.ui.table_widget.setRowCount(self.machine.state_value)
-        self.ui.table_widget.horizontalHeaderItem(0).setText("_")
+        self.machine.cache = self.result_cache
+        self.machine.overview = TapeOverview(self.machine.alph_value)
+        self.table_model.set_machine(self.machine)
 
         # Set upper limit for alph
         self.ui.cell_value_box.setMaximum(self.machine.alph_value - 1)
 
-        for i in range(self.machine.alph_value):
-            item = QTableWidgetItem()
-            self.ui.table_widget.setHorizontalHeaderItem(i + 1, item)
-            self.ui.table_widget.horizontalHeaderItem(i + 1).setText(str(i))
-
-        for i in range(self.machine.state_value):
-            item = QTableWidgetItem()
-            self.ui.table_widget.setVerticalHeaderItem(i, item)
-            self.ui.table_widget. \
-                verticalHeaderItem(i).setText(f"Q{str(i + 1)}")
-
-        # Algo table validation
-        self.allowed_val_set = {"N", "_"}
-        self.allowed_val_set.update(
-            map(lambda x: str(x), range(self.machine.alph_value))
+    def update_tape_graphics(self):
+        lo, hi = self.visible_cells()
+        if self.tape_scene.off_center((lo + hi) // 2):
+            # moves the scene's origin and comes back here
+            self.scroll_to_cell((lo + hi) // 2)
+            return
+        # while the worker runs, draw only from the snapshot it published
+        # last, never from the tape it is writing to; the first one is
+        # published here before it starts
+        self.worker.view = lo, hi
+        self.machine.overview.request = self.ui.overview.request()
+        if self.worker.isRunning():
+            snapshot = self.worker.snapshot
+            tape, head, step = snapshot.tape, snapshot.head, snapshot.step
+            overview = snapshot.overview
+        else:
+            tape = self.machine.tape
+            head = self.machine.current_tape_cell
+            step = self.machine.history.step
+            overview = self.machine.overview_image()
+        self.tape_scene.refresh(tape, head, lo, hi)
+        if overview is not None:
+            self.ui.overview.set_image(overview)
+        self.ui.overview.set_viewport(lo + 1, hi - 1)
+        if self.machine.profile is not None:
+            self.update_heatmap()
+        self.ui.statusbar.showMessage(f"Step {step}")
+
+    def toggle_heatmap(self, enabled: bool) -> None:
+        self.machine.profiling = enabled
+        self.machine.profile = None
+        self.update_heatmap()
+
+    def toggle_native(self, enabled: bool) -> None:
+        from native import resolve_backend
+        backend = resolve_backend("numba" if enabled else "python")
+        if enabled and backend == "python":
+            QMessageBox.warning(
+                self, "Numba", "Numba is not installed, running in Python"
+            )
+            self.ui.native_box.setChecked(False)
+            return
+        self.machine.backend = backend
+
+    def toggle_accelerate(self, enabled: bool) -> None:
+        self.machine.accelerate = enabled
+
+    def update_heatmap(self) -> None:
+        profile = self.machine.profile
+        self.table_model.set_heatmap(
+            profile.heatmap() if profile is not None else []
         )
-        self.allowed_move_set = {"L", "R", "S"}
-        self.allowd_next_step_set = {
-            'Q' + str(i) for i in range(self.machine.state_value + 1)
-        }
 
-    def update_tape_graphics(self):
-        with QMutexLocker(self.machine.mutex):
-            scene = QGraphicsScene()
-            for ind, value in enumerate(self.machine.tape):
-                rect_item = QGraphicsRectItem(
-                    ind * self.cell_size,
-                    0,
-                    self.cell_size,
-                    self.cell_size,
-                )
-                if ind == self.machine.current_tape_cell:
-                    rect_item.setBrush(Qt.GlobalColor.red)
-                else:
-                    rect_item.setBrush(
-                        Qt.GlobalColor.gray if value != "_"
-                        else Qt.GlobalColor.black
-                    )
-                scene.addItem(rect_item)
-
-                # add digits
-                text_item = QGraphicsTextItem(str(value))
-                item_font = QFont("Times New Roman", 40)
-                item_font.setBold(True)
-                text_item.setFont(item_font)
-                text_item.adjustSize()
-                text_item.setPos(
-                    ind * self.cell_size + self.cell_size/2 -
-                    text_item.boundingRect().width()/2,
-                    self.cell_size/2 - text_item.boundingRect().height()/2
-                )
-                scene.addItem(text_item)
-
-            self.ui.graphics_view.setScene(scene)
+    def visible_cells(self) -> tuple[int, int]:
+        view = self.ui.graphics_view
+        rect = view.mapToScene(view.viewport().rect()).boundingRect()
+        origin = self.tape_scene.origin
+        return (
+            origin + floor(rect.left() / self.cell_size) - 1,
+            origin + ceil(rect.right() / self.cell_size) + 1,
+        )
+
+    def scroll_to_cell(self, cell: int) -> None:
+        # a cell far from the scene's origin becomes the new origin first,
+        # and the scene is redrawn around it even if the scroll bar keeps
+        # its value
+        lo, hi = self.tape_scene.span
+        cell = max(min(cell, hi - 1), lo)
+        recenter = self.tape_scene.off_center(cell)
+        if recenter:
+            self.tape_scene.recenter(cell)
+        view = self.ui.graphics_view
+        bar = view.horizontalScrollBar()
+        x = self.tape_scene.x_of(cell) + (
+            self.cell_size - view.viewport().width()
+        ) / 2
+        bar.setValue(int(min(max(x, bar.minimum()), bar.maximum())))
+        if recenter:
+            self.update_tape_graphics()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self.update_tape_graphics()
 
     def set_empty_value(self):
-        self.machine.tape[self.machine.current_tape_cell] = "_"
+        self.machine.tape[self.machine.current_tape_cell] = BLANK
+        self.machine.forget_history()
         self.update_tape_graphics()
 
     def set_cell_value(self):
         new_value = self.ui.cell_value_box.value()
-        self.machine.tape[self.machine.current_tape_cell] = new_value
+        self.machine.tape[self.machine.current_tape_cell] = \
+            symbol_code(new_value)
+        self.machine.forget_history()
         self.update_tape_graphics()
 
     def on_mouse_clicked(self, event):
+        if self.worker.isRunning():
+            return
         pos = event.pos()
         scene_pos = self.ui.graphics_view.mapToScene(pos)
-        for ind, value in enumerate(self.machine.tape):
-            rect = QRectF(
-                ind * self.cell_size, 0, self.cell_size, self.cell_size
-            )
-            if rect.contains(scene_pos):
-                self.machine.current_tape_cell = ind
-                self.machine.check_tape_expantion()
-                self.update_tape_graphics()
-
-    def parse_table_values(self) -> None:
-        table_data = []
-        for row in range(self.ui.table_widget.rowCount()):
-            row_data = []
-            for col in range(self.ui.table_widget.columnCount()):
-                item = self.ui.table_widget.item(row, col)
-                if item is not None:
-                    cell_value = item.text()
-                    row_data.append(cell_value)
-                else:
-                    row_data.append("")
-            table_data.append(row_data)
-        self.machine.table_data = table_data
-
-    def populate_table(self) -> None:
-        for row_num, row_val in enumerate(self.machine.table_data):
-            for col_num, cell_val in enumerate(row_val):
-                self.ui.table_widget.setItem(
-                    row_num, col_num, QTableWidgetItem(cell_val)
-                )
-
-    def __validate_table(self):
-        self.machine.is_ready_to_start = True
-        for row, row_val in enumerate(self.machine.table_data):
-            for col, cell_val in enumerate(row_val):
-                self.__validate_table_cell(cell_val, row, col)
-
-    def __validate_table_cell(
-        self, cell_value: str, row: int, col: int
-    ) -> None:
-        col_msg = str(col - 1) if col > 0 else "_"
-        row_msg = row + 1
-        try:
-            val_change, move, step = cell_value.split(" ")
-        except ValueError:
-            QMessageBox.critical(
-                self, "Fail",
-                f"Wrong number of arguments, cell {col_msg}-Q{row_msg}"
-            )
-            self.machine.is_ready_to_start = False
-            return
-
-        if val_change not in self.allowed_val_set:
-            QMessageBox.critical(
-                self, "Fail",
-                f"Wrong new value {val_change}, cell {col_msg}-Q{row_msg}"
-            )
-            self.machine.is_ready_to_start = False
+        ind = self.tape_scene.cell_at(scene_pos.x())
+        tape = self.machine.tape
+        if not 0 <= scene_pos.y() < self.cell_size:
             return
-        if move not in self.allowed_move_set:
+        if tape.lo <= ind < tape.hi:
+            self.machine.current_tape_cell = ind
+            self.machine.check_tape_expantion()
+            self.machine.forget_history()
+            self.update_tape_graphics()
+
+    def __validate_table(self) -> bool:
+        builder = self.machine.table_builder()
+        self.machine.is_ready_to_start = builder.valid
+        if not builder.valid:
+            errors = builder.error_messages()
+            if len(errors) > MAX_SHOWN_ERRORS:
+                errors = errors[:MAX_SHOWN_ERRORS] + [
+                    f"... and {len(errors) - MAX_SHOWN_ERRORS} more"
+                ]
             QMessageBox.critical(
-                self, "Fail",
-                f"Wrong move value {move}, cell {col_msg}-Q{row_msg}"
+                self, "Fail", "Errors in Table\n\n" + "\n".join(errors)
             )
-            self.machine.is_ready_to_start = False
-            return
-        if step not in self.allowd_next_step_set:
-            QMessageBox.critical(
-                self, "Fail",
-                f"Wrong next step value {step}, cell {col_msg}-Q{row_msg}"
-            )
-            self.machine.is_ready_to_start = False
-            return
+        return builder.valid
 
     def exec_single_step(self) -> None:
-        self.__validate_table()
-        if not self.machine.is_ready_to_start:
-            QMessageBox.critical(self, "Fail", "Errors in Table")
+        if not self.__validate_table():
             return
         self.machine.single_step()
         self.update_tape_graphics()
 
+    def exec_step_back(self) -> None:
+        if not self.machine.step_back():
+            QMessageBox.information(self, "History", "No earlier steps")
+        self.update_tape_graphics()
+
+    def exec_jump(self) -> None:
+        if not self.__validate_table():
+            return
+        target = self.ui.jump_box.value()
+        if target > self.machine.history.step:
+            # forward jumps can be long, so they run in the worker and can
+            # be stopped like any other run
+            self.__start_worker(0, target)
+            return
+        try:
+            self.machine.jump_to_step(target)
+        except ValueError as e:
+            QMessageBox.critical(self, "Fail", str(e))
+        self.update_tape_graphics()
+
     def __block_buttons_during_loop(self) -> None:
         self.ui.set_empty_btn.setEnabled(False)
         self.ui.cell_val_btn.setEnabled(False)
         self.ui.one_step_btn.setEnabled(False)
+        self.ui.step_back_btn.setEnabled(False)
+        self.ui.jump_btn.setEnabled(False)
+        self.ui.jump_box.setEnabled(False)
         self.ui.many_steps_btn.setEnabled(False)
         self.ui.save_state_btn.setEnabled(False)
         self.ui.load_state_btn.setEnabled(False)
+        self.ui.trace_btn.setEnabled(False)
         self.ui.cell_value_box.setEnabled(False)
         self.ui.step_pause.setEnabled(False)
 
     def __release_buttons_after_loop(self) -> None:
+        self.frame_timer.stop()
         self.ui.set_empty_btn.setEnabled(True)
         self.ui.cell_val_btn.setEnabled(True)
         self.ui.one_step_btn.setEnabled(True)
+        self.ui.step_back_btn.setEnabled(True)
+        self.ui.jump_btn.setEnabled(True)
+        self.ui.jump_box.setEnabled(True)
         self.ui.many_steps_btn.setEnabled(True)
         self.ui.save_state_btn.setEnabled(True)
         self.ui.load_state_btn.setEnabled(True)
+        self.ui.trace_btn.setEnabled(True)
         self.ui.cell_value_box.setEnabled(True)
         self.ui.step_pause.setEnabled(True)
 
     def exec_many_steps(self) -> None:
-        delay = self.ui.step_pause.value()
-        self.worker.delay = delay
-        self.__validate_table()
-        if not self.machine.is_ready_to_start:
-            QMessageBox.critical(self, "Fail", "Errors in Table")
+        if not self.__validate_table():
+            return
+        self.__start_worker(self.ui.step_pause.value())
+
+    def __start_worker(self, delay: float, target: int | None = None) -> None:
+        if self.worker.isRunning():
             return
+        self.worker.delay = delay
+        self.worker.target = target
         self.__block_buttons_during_loop()
-        if not self.worker.isRunning():
-            self.worker.start()
+        # without a pause the worker runs flat out and the tape is sampled
+        # at a fixed frame rate instead of on every step
+        if delay == 0:
+            self.frame_timer.start()
+        self.worker.publish()
+        self.worker.start()
 
     def stop_exec(self) -> None:
         if self.worker.isRunning():
             self.worker.stop()
 
+    def __worker_finished(self) -> None:
+        # finished is emitted just before the thread ends, so wait for it
+        # before anything touches the machine again
+        self.worker.wait()
+        self.__release_buttons_after_loop()
+        self.update_tape_graphics()
+
     def save_state(self) -> None:
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Save State",
-            "./saved_states", "JSON Files (*.json);;All Files (*)"
+            "./saved_states", FILE_FILTER
         )
         if not file_path:
             return
-        self.machine.save_to_file(file_path)
+        data = self.machine.save_data()
+        self.file_worker = SaveWorker(file_path, data, self)
+        self.file_worker.saved.connect(
+            lambda path: self.ui.statusbar.showMessage(f"Saved {path}", 5000)
+        )
+        self.__start_file_worker("Saving")
 
     def load_state(self) -> None:
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Save State",
-            "./saved_states", "JSON Files (*.json);;All Files (*)"
+            "./saved_states", FILE_FILTER
+        )
+        if not file_path:
+            return
+        self.file_worker = LoadWorker(file_path, self)
+        self.file_worker.loaded.connect(self.on_machine_loaded)
+        self.__start_file_worker("Loading")
+
+    def export_trace(self) -> None:
+        if not self.__validate_table():
+            return
+        max_steps, ok = QInputDialog.getInt(
+            self, "Trace", "Steps to trace:", TRACE_STEPS, 1, 2**31 - 1
+        )
+        if not ok:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Trace", "./saved_states", TRACE_FILE_FILTER
         )
         if not file_path:
             return
-        with open(file_path, "r") as f:
-            data = json.load(f)
+        engine = self.machine.trace_engine()
+        self.file_worker = TraceWorker(file_path, engine, max_steps, self)
+        self.file_worker.traced.connect(
+            lambda records: self.ui.statusbar.showMessage(
+                f"Traced {records} steps to {file_path}", 5000
+            )
+        )
+        self.__start_file_worker("Tracing")
+
+    def __start_file_worker(self, action: str) -> None:
+        # big tapes take a while to write or decode, so files are handled
+        # in the background and only the result comes back to this thread;
+        # the machine can't be run or edited until then
+        self.__block_buttons_during_loop()
+        self.file_worker.progress.connect(
+            lambda percent: self.ui.statusbar.showMessage(
+                f"{action}... {percent}%"
+            )
+        )
+        self.file_worker.failed.connect(
+            lambda message: QMessageBox.critical(self, "Fail", message)
+        )
+        self.file_worker.finished.connect(self.__file_worker_finished)
+        self.file_worker.start()
+
+    def __file_worker_finished(self) -> None:
+        self.file_worker.wait()
+        self.__release_buttons_after_loop()
+        self.file_worker = None
+
+    def on_machine_loaded(self, data: dict) -> None:
         self.machine = TuringMachineApp(**data)
+        self.machine.profiling = self.ui.heatmap_box.isChecked()
+        if self.ui.native_box.isChecked():
+            self.machine.backend = "numba"
+        self.machine.accelerate = self.ui.accelerate_box.isChecked()
         self.worker.machine = self.machine
         self.create_ui()
-        self.populate_table()
         self.update_tape_graphics()
 
 
 class Worker(QThread):
     signal = pyqtSignal()
-    btn_signal = pyqtSignal()
+    failed = pyqtSignal(str)
 
     def __init__(self, machine: TuringMachineApp) -> None:
         super().__init__()
         self.machine = machine
         self.running = False
         self.delay = 1.0
+        self.batch_size = 10000
+        # a step to run up to and stop at, for jumps forward
+        self.target: int | None = None
+        # set by the GUI thread; the worker replaces snapshot as a whole
+        # after every batch, so readers never see a half-written state.
+        # running is only cleared from outside, the worker tidies up the
+        # machine itself once its loop ends
+        self.view = (0, 0)
+        self.snapshot: MachineSnapshot | None = None
+        self.overview_time = 0.0
+
+    def publish(self) -> None:
+        lo, hi = self.view
+        # the overview is only brought up to date once a frame, and always
+        # when the run ends
+        now = perf_counter()
+        update_overview = not self.running or (
+            now - self.overview_time >= 1 / REFRESH_RATE
+        )
+        if update_overview:
+            self.overview_time = now
+        self.snapshot = self.machine.snapshot(lo, hi, update_overview)
 
     def run(self) -> None:
         self.running = True
+        # compiled once: the table stays editable during the run. Any
+        # exception escaping QThread.run would abort the application
+        keep_state = False
+        try:
+            table = self.machine.compiled_table()
+            if self.target is not None:
+                self.run_to_target(table)
+                # a jump keeps the state it ends on
+                keep_state = True
+            elif self.delay == 0:
+                self.run_flat_out(table)
+            else:
+                self.run_with_pause(table)
+        except Exception as e:
+            self.failed.emit(str(e) or type(e).__name__)
+        self.running = False
+        if not keep_state:
+            self.machine.run_start = None
+            self.machine.current_table_state = 1
+        self.signal.emit()
+
+    def run_with_pause(self, table: CompiledTable) -> None:
         while self.running:
-            if self.machine.single_step():
+            if self.machine.single_step(table):
+                self.publish()
                 self.signal.emit()
                 sleep(self.delay)
             else:
-                self.signal.emit()
                 self.stop()
+                self.publish()
+
+    def run_flat_out(self, table: CompiledTable) -> None:
+        if self.machine.run_from_cache(table):
+            self.stop()
+            self.publish()
+        while self.running:
+            if not self.machine.run_steps(self.batch_size, table):
+                self.stop()
+            self.publish()
+
+    def run_to_target(self, table: CompiledTable) -> None:
+        # like run_flat_out, but the last batch ends on the target and the
+        # machine keeps its state there
+        while self.running:
+            steps = min(
+                self.batch_size, self.target - self.machine.history.step
+            )
+            if steps <= 0 or not self.machine.run_steps(steps, table):
+                self.stop()
+            self.publish()
 
     def stop(self) -> None:
         self.running = False
-        self.machine.current_table_state = 1
-        self.btn_signal.emit()
 
 
 if __name__ == "__main__":
@@ -20,27 +20,12 @@ class Ui_MainWindow(object):
         self.graphics_view = QtWidgets.QGraphicsView(parent=self.centralwidget)
         self.graphics_view.setObjectName("graphics_view")
         self.verticalLayout.addWidget(self.graphics_view)
-        self.table_widget = QtWidgets.QTableWidget(parent=self.centralwidget)
-        self.table_widget.setObjectName("table_widget")
-        self.table_widget.setColumnCount(2)
-        self.table_widget.setRowCount(2)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setVerticalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setVerticalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setHorizontalHeaderItem(0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setHorizontalHeaderItem(1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setItem(0, 0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setItem(0, 1, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setItem(1, 0, item)
-        item = QtWidgets.QTableWidgetItem()
-        self.table_widget.setItem(1, 1, item)
-        self.verticalLayout.addWidget(self.table_widget)
+        self.overview = TapeOverviewWidget(parent=self.centralwidget)
+        self.overview.setObjectName("overview")
+        self.verticalLayout.addWidget(self.overview)
+        self.table_view = QtWidgets.QTableView(parent=self.centralwidget)
+        self.table_view.setObjectName("table_view")
+        self.verticalLayout.addWidget(self.table_view)
         self.horizontalLayout = QtWidgets.QHBoxLayout()
         self.horizontalLayout.setObjectName("horizontalLayout")
         self.verticalLayout_2 = QtWidgets.QVBoxLayout()
@@ -69,6 +54,19 @@ class Ui_MainWindow(object):
         self.one_step_btn = QtWidgets.QPushButton(parent=self.centralwidget)
         self.one_step_btn.setObjectName("one_step_btn")
         self.verticalLayout_2.addWidget(self.one_step_btn)
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.step_back_btn = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.step_back_btn.setObjectName("step_back_btn")
+        self.horizontalLayout_6.addWidget(self.step_back_btn)
+        self.jump_btn = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.jump_btn.setObjectName("jump_btn")
+        self.horizontalLayout_6.addWidget(self.jump_btn)
+        self.jump_box = QtWidgets.QSpinBox(parent=self.centralwidget)
+        self.jump_box.setMaximum(2147483647)
+        self.jump_box.setObjectName("jump_box")
+        self.horizontalLayout_6.addWidget(self.jump_box)
+        self.verticalLayout_2.addLayout(self.horizontalLayout_6)
         self.horizontalLayout_5 = QtWidgets.QHBoxLayout()
         self.horizontalLayout_5.setObjectName("horizontalLayout_5")
         self.many_steps_btn = QtWidgets.QPushButton(parent=self.centralwidget)
@@ -76,7 +74,6 @@ class Ui_MainWindow(object):
         self.horizontalLayout_5.addWidget(self.many_steps_btn)
         self.step_pause = QtWidgets.QDoubleSpinBox(parent=self.centralwidget)
         self.step_pause.setDecimals(1)
-        self.step_pause.setMinimum(0.1)
         self.step_pause.setMaximum(10.0)
         self.step_pause.setSingleStep(0.1)
         self.step_pause.setObjectName("step_pause")
@@ -85,6 +82,15 @@ class Ui_MainWindow(object):
         self.stop_btn = QtWidgets.QPushButton(parent=self.centralwidget)
         self.stop_btn.setObjectName("stop_btn")
         self.verticalLayout_2.addWidget(self.stop_btn)
+        self.heatmap_box = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.heatmap_box.setObjectName("heatmap_box")
+        self.verticalLayout_2.addWidget(self.heatmap_box)
+        self.native_box = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.native_box.setObjectName("native_box")
+        self.verticalLayout_2.addWidget(self.native_box)
+        self.accelerate_box = QtWidgets.QCheckBox(parent=self.centralwidget)
+        self.accelerate_box.setObjectName("accelerate_box")
+        self.verticalLayout_2.addWidget(self.accelerate_box)
         self.line_2 = QtWidgets.QFrame(parent=self.centralwidget)
         self.line_2.setFrameShape(QtWidgets.QFrame.Shape.HLine)
         self.line_2.setFrameShadow(QtWidgets.QFrame.Shadow.Sunken)
@@ -96,6 +102,9 @@ class Ui_MainWindow(object):
         self.load_state_btn = QtWidgets.QPushButton(parent=self.centralwidget)
         self.load_state_btn.setObjectName("load_state_btn")
         self.verticalLayout_2.addWidget(self.load_state_btn)
+        self.trace_btn = QtWidgets.QPushButton(parent=self.centralwidget)
+        self.trace_btn.setObjectName("trace_btn")
+        self.verticalLayout_2.addWidget(self.trace_btn)
         self.new_machine_btn = QtWidgets.QPushButton(parent=self.centralwidget)
         self.new_machine_btn.setObjectName("new_machine_btn")
         self.verticalLayout_2.addWidget(self.new_machine_btn)
@@ -119,24 +128,19 @@ class Ui_MainWindow(object):
     def retranslateUi(self, MainWindow):
         _translate = QtCore.QCoreApplication.translate
         MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
-        item = self.table_widget.verticalHeaderItem(0)
-        item.setText(_translate("MainWindow", "Q1"))
-        item = self.table_widget.verticalHeaderItem(1)
-        item.setText(_translate("MainWindow", "Q2"))
-        item = self.table_widget.horizontalHeaderItem(0)
-        item.setText(_translate("MainWindow", "_"))
-        item = self.table_widget.horizontalHeaderItem(1)
-        item.setText(_translate("MainWindow", "0"))
-        __sortingEnabled = self.table_widget.isSortingEnabled()
-        self.table_widget.setSortingEnabled(False)
-        self.table_widget.setSortingEnabled(__sortingEnabled)
         self.cell_val_btn.setText(_translate("MainWindow", "Установить значение"))
         self.set_empty_btn.setText(_translate("MainWindow", "Пустое значение"))
         self.one_step_btn.setText(_translate("MainWindow", "Пуск на 1 шаг"))
+        self.step_back_btn.setText(_translate("MainWindow", "Шаг назад"))
+        self.jump_btn.setText(_translate("MainWindow", "Перейти к шагу"))
         self.many_steps_btn.setText(_translate("MainWindow", "Пуск с паузой между шагами"))
         self.stop_btn.setText(_translate("MainWindow", "Стоп"))
+        self.heatmap_box.setText(_translate("MainWindow", "Тепловая карта переходов"))
+        self.native_box.setText(_translate("MainWindow", "Быстрый запуск (Numba)"))
+        self.accelerate_box.setText(_translate("MainWindow", "Пропускать проходы по одинаковым ячейкам"))
         self.save_state_btn.setText(_translate("MainWindow", "Сохранить состояние"))
         self.load_state_btn.setText(_translate("MainWindow", "Загрузить состояние"))
+        self.trace_btn.setText(_translate("MainWindow", "Записать трассу"))
         self.new_machine_btn.setText(_translate("MainWindow", "Новая машина"))
         self.textBrowser.setHtml(_translate("MainWindow", "<!DOCTYPE HTML PUBLIC \"-//W3C//DTD HTML 4.0//EN\" \"http://www.w3.org/TR/REC-html40/strict.dtd\">\n"
 "<html><head><meta name=\"qrichtext\" content=\"1\" /><style type=\"text/css\">\n"
@@ -155,6 +159,7 @@ class Ui_MainWindow(object):
 "<p style=\" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;\"><span style=\" font-size:11pt;\">10 L Q3</span></p></body></html>"))
         self.actionNew.setText(_translate("MainWindow", "Новая машина"))
         self.action.setText(_translate("MainWindow", "Выход"))
+from overview_widget import TapeOverviewWidget
 
 
 if __name__ == "__main__":
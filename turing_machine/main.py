@@ -1,10 +1,11 @@
 import sys
-import json
-from PyQt6.QtWidgets import QApplication, QWidget, QFileDialog
+from PyQt6.QtWidgets import QApplication, QWidget, QFileDialog, QMessageBox
 from PyQt6.QtCore import pyqtSlot
 
 from open import Ui_Form
-from machine import TuringMachineGUI, TuringMachineApp
+from app import TuringMachineApp
+from snapshot import FILE_FILTER
+from file_workers import LoadWorker
 
 
 class OpenScreenGUI(QWidget):
@@ -17,8 +18,12 @@ class OpenScreenGUI(QWidget):
         self.ui.load_btn.clicked.connect(self.load_state)
         self.ui.state_box.minimum = 1
         self.new_window = None
+        self.load_worker = None
 
     def create_new(self):
+        # the editor window pulls in most of the GUI, so it is imported
+        # when first opened rather than before the start screen shows
+        from machine import TuringMachineGUI
         state_value = self.ui.state_box.value()
         alph_value = self.ui.alph_box.value()
         machine = TuringMachineApp(
@@ -33,18 +38,25 @@ class OpenScreenGUI(QWidget):
     def load_state(self) -> None:
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Save State",
-            "./saved_states", "JSON Files (*.json);;All Files (*)"
+            "./saved_states", FILE_FILTER
         )
-        with open(file_path, "r") as f:
-            data = json.load(f)
-        machine = TuringMachineApp(**data)
-        # TODO: bad code
-        table_data = machine.table_data
-        self.new_window = TuringMachineGUI(machine=machine)
-        self.new_window.machine.table_data = table_data
+        if not file_path:
+            return
+        self.ui.load_btn.setEnabled(False)
+        self.load_worker = LoadWorker(file_path, self)
+        self.load_worker.loaded.connect(self.open_loaded)
+        self.load_worker.failed.connect(
+            lambda message: QMessageBox.critical(self, "Fail", message)
+        )
+        self.load_worker.finished.connect(
+            lambda: self.ui.load_btn.setEnabled(True)
+        )
+        self.load_worker.start()
+
+    def open_loaded(self, data: dict) -> None:
+        from machine import TuringMachineGUI
+        self.new_window = TuringMachineGUI(machine=TuringMachineApp(**data))
         self.new_window.open_requested.connect(self.show_again)
-        self.new_window.populate_table()
-        self.new_window.update_tape_graphics()
         self.new_window.show()
         self.hide()
 
@@ -0,0 +1,88 @@
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = njit = None
+
+from engine import HALT, KEEP, CompiledTable, Engine
+
+
+BACKENDS = ("python", "numba")
+AVAILABLE = njit is not None
+
+
+def resolve_backend(backend: str) -> str:
+    # the numba backend falls back to the plain Python loops when numba
+    # isn't installed; both give the same results
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}")
+    if backend == "numba" and not AVAILABLE:
+        return "python"
+    return backend
+
+
+def _run_array(write, move, next_state, width, buffer, inx, state, max_steps):
+    # Engine.__run_array over NumPy arrays; returns as soon as the head
+    # reaches the edge of the buffer so the tape can grow in Python
+    size = buffer.shape[0]
+    done = 0
+    while done < max_steps and state != HALT:
+        cell = (state - 1) * width + buffer[inx]
+        val = write[cell]
+        if val != KEEP:
+            buffer[inx] = val
+        inx += move[cell]
+        state = next_state[cell]
+        done += 1
+        if inx <= 0 or inx + 1 >= size:
+            break
+    return inx, state, done
+
+
+if AVAILABLE:
+    _run_array = njit(cache=True, nogil=True)(_run_array)
+
+
+class NativeRunner:
+    # JIT-compiled step loop for ArrayTape engines, attached the same way
+    # as a Profile; other tapes keep their normal loops
+    def __init__(self, table: CompiledTable) -> None:
+        if not AVAILABLE:
+            raise ImportError("The numba backend requires numba")
+        self.table = table
+        self.write = np.array(table.write, dtype=np.int32)
+        self.move = np.array(table.move, dtype=np.int32)
+        self.next_state = np.array(table.next_state, dtype=np.int32)
+
+    def run(self, engine: Engine, max_steps: int) -> int:
+        tape = engine.tape
+        inx = engine.head + tape.offset
+        state = engine.state
+        done = 0
+        while done < max_steps and state != HALT:
+            # the view has to be gone before ensure() can resize the buffer
+            buffer = np.frombuffer(tape.buffer, dtype=np.uint8)
+            inx, state, count = _run_array(
+                self.write,
+                self.move,
+                self.next_state,
+                self.table.width,
+                buffer,
+                inx,
+                state,
+                max_steps - done,
+            )
+            del buffer
+            done += count
+            pos = inx - tape.offset
+            tape.ensure(pos)
+            inx = pos + tape.offset
+        engine.head = inx - tape.offset
+        engine.state = state
+        return done
+
+
+def use_backend(engine: Engine, backend: str) -> str:
+    backend = resolve_backend(backend)
+    engine.native = NativeRunner(engine.table) if backend == "numba" else None
+    return backend
@@ -0,0 +1,214 @@
+import sys
+import json
+import argparse
+from dataclasses import dataclass
+
+from engine import (
+    HALT,
+    KEEP,
+    MOVE_NAMES,
+    CompiledTable,
+    cell_name,
+    compile_table,
+)
+from snapshot import load_machine, save_machine_data
+from tape import BLANK
+
+
+def reachable_states(
+    table: CompiledTable, roots: tuple[int, ...] = (1,)
+) -> list[int]:
+    # breadth-first from the roots, so the start state keeps number 1
+    order = [state for state in dict.fromkeys(roots) if state != HALT]
+    seen = set(order)
+    for state in order:
+        start = (state - 1) * table.width
+        for next_state in table.next_state[start:start + table.width]:
+            if next_state != HALT and next_state not in seen:
+                seen.add(next_state)
+                order.append(next_state)
+    return order
+
+
+def normalize_writes(table: CompiledTable) -> CompiledTable:
+    # writing back the symbol that was read is the same as N
+    width = table.width
+    return CompiledTable(
+        table.state_value,
+        table.alph_value,
+        tuple(
+            KEEP if val == inx % width else val
+            for inx, val in enumerate(table.write)
+        ),
+        table.move,
+        table.next_state,
+    )
+
+
+def partition_states(table: CompiledTable, states: list[int]) -> dict:
+    # Moore-style refinement: start from what every state writes and how
+    # it moves, then split blocks whose transitions lead to different
+    # blocks until nothing changes; HALT is a block of its own
+    width = table.width
+
+    def cells(state: int) -> range:
+        start = (state - 1) * width
+        return range(start, start + width)
+
+    def numbered(keys: dict) -> dict:
+        ids: dict = {}
+        return {
+            state: ids.setdefault(key, len(ids))
+            for state, key in keys.items()
+        }
+
+    block = numbered({
+        state: tuple(
+            (table.write[cell], table.move[cell]) for cell in cells(state)
+        )
+        for state in states
+    })
+    while True:
+        refined = numbered({
+            state: (block[state], tuple(
+                block.get(table.next_state[cell], -1)
+                for cell in cells(state)
+            ))
+            for state in states
+        })
+        if len(set(refined.values())) == len(set(block.values())):
+            return refined
+        block = refined
+
+
+@dataclass(frozen=True)
+class Optimization:
+    table: CompiledTable
+    # old state -> new state; unreachable states are missing
+    states: dict[int, int]
+    original_states: int
+
+    @property
+    def removed(self) -> list[int]:
+        return [
+            state for state in range(1, self.original_states + 1)
+            if state not in self.states
+        ]
+
+    @property
+    def merged(self) -> list[list[int]]:
+        groups: dict[int, list[int]] = {}
+        for old, new in self.states.items():
+            groups.setdefault(new, []).append(old)
+        return [sorted(group) for group in groups.values() if len(group) > 1]
+
+    @property
+    def skips(self) -> list[int]:
+        # self-loops that only move the head; the accelerated engine runs
+        # these (CompiledTable.sweeps) as one jump over the whole run
+        return [
+            cell for cell, sweep in enumerate(self.table.sweeps)
+            if sweep and self.table.write[cell] == KEEP
+        ]
+
+    def report(self) -> dict:
+        width = self.table.width
+        return {
+            "states": self.original_states,
+            "optimized_states": self.table.state_value,
+            "removed": [f"Q{state}" for state in self.removed],
+            "merged": [
+                [f"Q{state}" for state in group] for group in self.merged
+            ],
+            "skips": [
+                cell_name(cell // width, cell % width) for cell in self.skips
+            ],
+        }
+
+
+def optimize(
+    table: CompiledTable, roots: tuple[int, ...] = (1,)
+) -> Optimization:
+    table = normalize_writes(table)
+    states = reachable_states(table, roots)
+    block = partition_states(table, states)
+    mapping = {state: block[state] + 1 for state in states}
+    representatives: dict[int, int] = {}
+    for state in states:
+        representatives.setdefault(block[state], state)
+    write, move, next_state = [], [], []
+    for state in representatives.values():
+        start = (state - 1) * table.width
+        for cell in range(start, start + table.width):
+            write.append(table.write[cell])
+            move.append(table.move[cell])
+            next_state.append(mapping.get(table.next_state[cell], HALT))
+    return Optimization(
+        CompiledTable(
+            len(representatives),
+            table.alph_value,
+            tuple(write),
+            tuple(move),
+            tuple(next_state),
+        ),
+        mapping,
+        table.state_value,
+    )
+
+
+def table_data(table: CompiledTable) -> list[list[str]]:
+    # the inverse of compile_table
+    def command(cell: int) -> str:
+        val = table.write[cell]
+        if val == KEEP:
+            raw_val = "N"
+        elif val == BLANK:
+            raw_val = "_"
+        else:
+            raw_val = str(val - 1)
+        raw_move = MOVE_NAMES[table.move[cell]]
+        return f"{raw_val} {raw_move} Q{table.next_state[cell]}"
+
+    return [
+        [command(row * table.width + col) for col in range(table.width)]
+        for row in range(table.state_value)
+    ]
+
+
+def optimize_machine(data: dict) -> tuple[dict, Optimization]:
+    # keeps whatever state the machine is in reachable, and renumbers it
+    table = compile_table(
+        data["table_data"], data["state_value"], data["alph_value"]
+    )
+    state = data.get("current_table_state") or 1
+    result = optimize(table, (1, state))
+    optimized = dict(data)
+    optimized["table_data"] = table_data(result.table)
+    optimized["state_value"] = result.table.state_value
+    optimized["current_table_state"] = result.states[state]
+    return optimized, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Remove unreachable and merge equivalent states"
+    )
+    parser.add_argument("file", help="machine JSON or snapshot file")
+    parser.add_argument(
+        "-o", "--output", help="write the optimized machine here"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        optimized, result = optimize_machine(load_machine(args.file))
+        if args.output:
+            save_machine_data(args.output, optimized)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{args.file}: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result.report(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+
+from tape import BLANK, MAX_ARRAY_ALPH, Tape
+
+
+# cells read from the tape at a time when pixels are recomputed, so a full
+# redraw of a huge tape doesn't copy it whole
+PAINT_CELLS = 1 << 20
+
+
+@dataclass(frozen=True)
+class OverviewImage:
+    # pixel i covers cells lo + i * scale up to lo + (i + 1) * scale
+    lo: int
+    scale: int
+    head: int
+    pixels: bytes
+
+    def cell_at(self, x: float) -> int:
+        return self.lo + int(x * self.scale)
+
+    def x_of(self, cell: int) -> float:
+        return (cell - self.lo) / self.scale
+
+
+class TapeOverview:
+    # the whole tape, or the part of it in request, at a power of two cells
+    # per pixel; a pixel holds the highest symbol code among its cells.
+    # d steps after the last update from head h the machine can only have
+    # written cells h - d..h + d, so only pixels over those (and the head,
+    # where the GUI edits cells) are recomputed
+    def __init__(self, alph_value: int) -> None:
+        # a pixel is a byte, so codes past one share the last color
+        self.wide = alph_value > MAX_ARRAY_ALPH
+        self.codes = range(min(alph_value, MAX_ARRAY_ALPH), BLANK, -1)
+        # (width in pixels, lo, hi); lo and hi None for the whole tape. Set
+        # by the GUI thread and read on update, like Worker.view
+        self.request: tuple[int, int | None, int | None] = (0, None, None)
+        self.lo = 0
+        self.scale = 1
+        self.pixels = bytearray()
+        self.last: tuple[int, int] | None = None
+        self.image: OverviewImage | None = None
+
+    def __layout(self, tape: Tape) -> tuple[int, int, int]:
+        width, lo, hi = self.request
+        width = max(width, 1)
+        fit = lo is None
+        if fit:
+            lo, hi = tape.lo, tape.hi
+        scale = 1
+        while True:
+            # the whole tape view moves in steps of half its width, so a
+            # growing tape redraws it only every so often
+            grid = max(scale, width * scale // 2) if fit else scale
+            start = lo // grid * grid
+            if hi <= start + width * scale:
+                return start, scale, width
+            scale *= 2
+
+    def update(self, tape: Tape, head: int, step: int) -> OverviewImage:
+        lo, scale, width = self.__layout(tape)
+        if self.last is None or (lo, scale, width) != (
+            self.lo, self.scale, len(self.pixels)
+        ):
+            self.lo, self.scale = lo, scale
+            self.pixels = bytearray(width)
+            self.__paint(tape, lo, lo + width * scale)
+        else:
+            last_step, last_head = self.last
+            reach = abs(step - last_step)
+            self.__paint(tape, last_head - reach, last_head + reach + 1)
+            self.__paint(tape, head, head + 1)
+        self.last = step, head
+        self.image = OverviewImage(
+            self.lo, self.scale, head, bytes(self.pixels)
+        )
+        return self.image
+
+    def __paint(self, tape: Tape, lo: int, hi: int) -> None:
+        scale = self.scale
+        first = max(lo - self.lo, 0) // scale
+        end = min(-(-(hi - self.lo) // scale), len(self.pixels))
+        chunk = max(PAINT_CELLS // scale, 1)
+        for start in range(first, end, chunk):
+            self.__paint_pixels(tape, start, min(start + chunk, end))
+
+    def __paint_pixels(self, tape: Tape, first: int, end: int) -> None:
+        scale = self.scale
+        cells_lo = self.lo + first * scale
+        cells_hi = self.lo + end * scale
+        if self.wide:
+            data = bytes(
+                min(code, MAX_ARRAY_ALPH)
+                for code in tape.cells(cells_lo, cells_hi)
+            )
+        else:
+            data = tape.packed(cells_lo, cells_hi)
+        if scale == 1:
+            self.pixels[first:end] = data
+            return
+        # bytes.find scans in C, so a pixel costs a few scans of its cells
+        # rather than a Python loop over them
+        codes = [code for code in self.codes if data.find(code) >= 0]
+        if not codes:
+            self.pixels[first:end] = bytes(end - first)
+            return
+        pixels = self.pixels
+        for inx in range(first, end):
+            at = (inx - first) * scale
+            for code in codes:
+                if data.find(code, at, at + scale) >= 0:
+                    pixels[inx] = code
+                    break
+            else:
+                pixels[inx] = BLANK
@@ -0,0 +1,179 @@
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+from PyQt6.QtCore import QRect, QRectF, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter, qRgb
+
+from overview import OverviewImage
+
+
+HEIGHT = 24
+# blank black and symbols in shades of gray, as in the tape scene
+COLORS = [qRgb(0, 0, 0)] + [
+    qRgb(shade, shade, shade)
+    for shade in (max(230 - 16 * code, 96) for code in range(255))
+]
+
+
+def changed_span(old: bytes, new: bytes) -> tuple[int, int]:
+    # first and past-the-last differing pixel of two equally long strips,
+    # bisecting on slice comparisons so the scan itself runs in C
+    if old == new:
+        return 0, 0
+    lo, hi = 0, len(new)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if old[:mid + 1] == new[:mid + 1]:
+            lo = mid + 1
+        else:
+            hi = mid
+    first = lo
+    hi = len(new)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if old[mid:] != new[mid:]:
+            lo = mid + 1
+        else:
+            hi = mid
+    return first, lo
+
+
+class TapeOverviewWidget(QWidget):
+    # the tape as a strip of pixels from overview.TapeOverview, stretched
+    # to the widget height; the frame is the part of the tape shown in the
+    # graphics view and can be dragged, the wheel zooms around the mouse
+    # and a double click shows the whole tape again
+    navigate = pyqtSignal(int)
+    zoomed = pyqtSignal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setFixedHeight(HEIGHT)
+        self.setSizePolicy(
+            QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.image: OverviewImage | None = None
+        self.strip = QImage()
+        self.viewport = (0, 0)
+        self.zoom: tuple[int, int] | None = None
+        self.whole_cells = 0
+        self.drag_offset = None
+
+    def request(self) -> tuple[int, int | None, int | None]:
+        lo, hi = self.zoom or (None, None)
+        return self.width(), lo, hi
+
+    def set_image(self, image: OverviewImage) -> None:
+        old = self.image
+        if image is old:
+            return
+        self.image = image
+        if self.zoom is None:
+            self.whole_cells = len(image.pixels) * image.scale
+        width = len(image.pixels)
+        if old is None or (old.lo, old.scale, len(old.pixels)) != (
+            image.lo, image.scale, width
+        ):
+            self.strip = QImage(width, 1, QImage.Format.Format_Indexed8)
+            self.strip.setColorTable(COLORS)
+            first, end = 0, width
+        else:
+            first, end = changed_span(old.pixels, image.pixels)
+        if first < end:
+            bits = self.strip.bits()
+            bits.setsize(self.strip.sizeInBytes())
+            bits[first:end] = image.pixels[first:end]
+            self.update(self.__span_rect(first, end))
+        if old is not None and old.head != image.head:
+            self.update(self.__cells_rect(old.head, old.head + 1, old))
+            self.update(self.__cells_rect(image.head, image.head + 1))
+
+    def set_viewport(self, lo: int, hi: int) -> None:
+        if (lo, hi) == self.viewport:
+            return
+        if self.image is not None:
+            self.update(self.__cells_rect(*self.viewport))
+            self.update(self.__cells_rect(lo, hi))
+        self.viewport = lo, hi
+
+    def __x(self, pixel: float) -> float:
+        return pixel * self.width() / max(self.strip.width(), 1)
+
+    def __span_rect(self, first: int, end: int) -> QRect:
+        left = int(self.__x(first))
+        return QRect(left - 1, 0, int(self.__x(end)) - left + 3, HEIGHT)
+
+    def __cells_rect(
+        self, lo: int, hi: int, image: OverviewImage | None = None
+    ) -> QRect:
+        image = image or self.image
+        return self.__span_rect(int(image.x_of(lo)), int(image.x_of(hi)) + 1)
+
+    def __cell_at(self, x: float) -> int:
+        strip_x = x * max(self.strip.width(), 1) / self.width()
+        return self.image.cell_at(strip_x)
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        rect = event.rect()
+        painter.fillRect(rect, Qt.GlobalColor.black)
+        if self.image is None:
+            return
+        scale_x = max(self.strip.width(), 1) / self.width()
+        painter.drawImage(
+            QRectF(rect.left(), 0, rect.width(), HEIGHT),
+            self.strip,
+            QRectF(rect.left() * scale_x, 0, rect.width() * scale_x, 1),
+        )
+        head = self.__x(self.image.x_of(self.image.head))
+        painter.fillRect(QRectF(head, 0, 1, HEIGHT), Qt.GlobalColor.red)
+        lo, hi = self.viewport
+        left = self.__x(self.image.x_of(lo))
+        right = self.__x(self.image.x_of(hi))
+        painter.setPen(QColor(255, 200, 0))
+        painter.drawRect(QRectF(left, 0, max(right - left, 2), HEIGHT - 1))
+
+    def mousePressEvent(self, event) -> None:
+        if self.image is None:
+            return
+        cell = self.__cell_at(event.position().x())
+        lo, hi = self.viewport
+        # dragging the frame keeps it where it was grabbed; a click
+        # elsewhere centers the view there
+        self.drag_offset = cell - (lo + hi) // 2 if lo <= cell < hi else 0
+        self.navigate.emit(cell - self.drag_offset)
+
+    def mouseMoveEvent(self, event) -> None:
+        if self.image is None or self.drag_offset is None:
+            return
+        cell = self.__cell_at(event.position().x())
+        self.navigate.emit(cell - self.drag_offset)
+
+    def mouseReleaseEvent(self, event) -> None:
+        self.drag_offset = None
+
+    def mouseDoubleClickEvent(self, event) -> None:
+        self.zoom = None
+        self.zoomed.emit()
+
+    def wheelEvent(self, event) -> None:
+        if self.image is None:
+            return
+        x = event.position().x()
+        cell = self.__cell_at(x)
+        cells = len(self.image.pixels) * self.image.scale
+        if event.angleDelta().y() > 0:
+            # no closer than a cell per pixel
+            cells = max(cells // 2, self.width())
+        else:
+            cells *= 2
+        if self.zoom is None and cells >= self.whole_cells:
+            return
+        if cells >= self.whole_cells:
+            self.zoom = None
+        else:
+            # aligned to the scale, or the overview would need the next
+            # power of two to cover it
+            scale = -(-cells // self.width())
+            lo = (cell - int(x * scale)) // scale * scale
+            self.zoom = lo, lo + self.width() * scale
+        self.zoomed.emit()
@@ -0,0 +1,90 @@
+from collections import Counter
+from time import perf_counter
+
+from engine import HALT, KEEP, CompiledTable, Engine, cell_name
+
+
+class Profile:
+    # counts how often every table cell fires while attached to an Engine;
+    # engines without a profile run their normal loops untouched
+    def __init__(self, table: CompiledTable, bucket: int = 1) -> None:
+        self.state_value = table.state_value
+        self.alph_value = table.alph_value
+        self.cell_counts = [0] * len(table.write)
+        self.bucket = bucket
+        self.head_counts: Counter[int] = Counter()
+        self.growth_events = 0
+        self.steps = 0
+        self.seconds = 0.0
+
+    def matches(self, table: CompiledTable) -> bool:
+        return (self.state_value, self.alph_value) == (
+            table.state_value, table.alph_value
+        )
+
+    def run(self, engine: Engine, max_steps: int) -> int:
+        table = engine.table
+        write, move, next_state = table.write, table.move, table.next_state
+        width = table.width
+        tape = engine.tape
+        counts = self.cell_counts
+        heads = self.head_counts
+        bucket = self.bucket
+        head = engine.head
+        state = engine.state
+        extent = tape.lo, tape.hi
+        start = perf_counter()
+        done = 0
+        while done < max_steps and state != HALT:
+            cell = (state - 1) * width + tape[head]
+            counts[cell] += 1
+            heads[head // bucket] += 1
+            val = write[cell]
+            if val != KEEP:
+                tape[head] = val
+            head += move[cell]
+            state = next_state[cell]
+            done += 1
+            tape.ensure(head)
+            if (tape.lo, tape.hi) != extent:
+                extent = tape.lo, tape.hi
+                self.growth_events += 1
+        engine.head = head
+        engine.state = state
+        self.seconds += perf_counter() - start
+        self.steps += done
+        return done
+
+    def heatmap(self) -> list[list[int]]:
+        width = self.alph_value + 1
+        return [
+            self.cell_counts[row * width:(row + 1) * width]
+            for row in range(self.state_value)
+        ]
+
+    def report(self, top: int = 10) -> dict:
+        width = self.alph_value + 1
+        hot = sorted(
+            range(len(self.cell_counts)),
+            key=self.cell_counts.__getitem__,
+            reverse=True,
+        )
+        return {
+            "steps": self.steps,
+            "seconds": self.seconds,
+            "steps_per_sec": self.steps / self.seconds if self.seconds else 0,
+            "growth_events": self.growth_events,
+            "heatmap": self.heatmap(),
+            "hot_transitions": [
+                {
+                    "cell": cell_name(*divmod(cell, width)),
+                    "count": self.cell_counts[cell],
+                }
+                for cell in hot[:top] if self.cell_counts[cell]
+            ],
+            "head_bucket": self.bucket,
+            "head_histogram": {
+                str(pos * self.bucket): count
+                for pos, count in sorted(self.head_counts.items())
+            },
+        }
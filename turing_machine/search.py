@@ -0,0 +1,387 @@
+import os
+import sys
+import json
+import argparse
+from dataclasses import dataclass
+
+from engine import HALT, KEEP, MOVES, CompiledTable
+from loops import tape_contents
+from optimize import table_data
+from tape import BLANK, ArrayTape, format_tape
+
+
+CHECKPOINT = "checkpoint.json"
+HALTED = "halted"
+UNDEFINED = "undefined"
+LOOP = "loop"
+RUNAWAY = "runaway"
+TRANSLATED = "translated"
+UNDECIDED = "undecided"
+
+# a partial table is a flat list over (state, symbol) cells, each None
+# while undefined or [write code, move, next state]
+Cells = list
+
+
+@dataclass
+class Outcome:
+    status: str
+    steps: int
+    cell: int | None = None
+    tape: ArrayTape | None = None
+
+
+def runs_away(cells: Cells, width: int, state: int, direction: int) -> bool:
+    # with only blanks ahead, a chain of blank transitions that all move
+    # further out and comes back to a state it passed never returns
+    seen = set()
+    while state not in seen:
+        seen.add(state)
+        entry = cells[(state - 1) * width + BLANK]
+        if entry is None or entry[2] == HALT or entry[1] != direction:
+            return False
+        state = entry[2]
+    return True
+
+
+class Edge:
+    # translated cycles at one end of the tape, again with Brent's
+    # algorithm: a record is a step that takes the head further out than
+    # ever. If a record comes in the state of the saved one, and the cells
+    # the head went back over since (from the saved record to reach) match
+    # the same cells shifted to the new record, the run only ever sees
+    # those cells and blanks, so it repeats shifted along the tape forever
+    def __init__(self, state: int, head: int, tape: ArrayTape) -> None:
+        self.limit = 1
+        self.save(state, head, 0, tape)
+
+    def save(self, state: int, head: int, steps: int, tape: ArrayTape) -> None:
+        self.saved = state, head, steps, tape.copy()
+        self.reach = head
+
+    def repeats(
+        self, state: int, head: int, steps: int, tape: ArrayTape
+    ) -> bool:
+        saved_state, saved_head, saved_steps, saved_tape = self.saved
+        if state == saved_state:
+            lo = min(saved_head, self.reach)
+            hi = max(saved_head, self.reach) + 1
+            shift = head - saved_head
+            if saved_tape.packed(lo, hi) == tape.packed(
+                lo + shift, hi + shift
+            ):
+                return True
+        if steps - saved_steps >= self.limit:
+            self.limit *= 2
+            self.save(state, head, steps, tape)
+        return False
+
+
+def simulate(cells: Cells, width: int, max_steps: int) -> Outcome:
+    # runs a partial table on a blank tape until it halts, needs a cell
+    # that is still undefined, repeats a configuration exactly (Brent's
+    # algorithm, as in loops.LoopDetector) or shifted (Edge), provably
+    # runs off into blank tape or reaches the step limit
+    tape = ArrayTape()
+    head = 0
+    tape.ensure(head)
+    state = 1
+    steps = 0
+    checkpoint = (state, head, tape_contents(tape))
+    distance = 0
+    limit = 1
+    right, left = Edge(state, head, tape), Edge(state, head, tape)
+    right_record = left_record = head
+    while steps < max_steps:
+        cell = (state - 1) * width + tape[head]
+        if cells[cell] is None:
+            return Outcome(UNDEFINED, steps, cell, tape)
+        val, step, state = cells[cell]
+        tape[head] = val
+        head += step
+        tape.ensure(head)
+        steps += 1
+        if state == HALT:
+            return Outcome(HALTED, steps, cell, tape)
+        distance += 1
+        if (state, head) == checkpoint[:2] and (
+            tape_contents(tape) == checkpoint[2]
+        ):
+            return Outcome(LOOP, steps, tape=tape)
+        if distance == limit:
+            limit *= 2
+            distance = 0
+            checkpoint = (state, head, tape_contents(tape))
+            first, contents = checkpoint[2]
+            if (head >= first + len(contents) or not contents) and runs_away(
+                cells, width, state, 1
+            ) or (head < first or not contents) and runs_away(
+                cells, width, state, -1
+            ):
+                return Outcome(RUNAWAY, steps, tape=tape)
+        # each edge's reach is the furthest the head went back from it
+        if head > right_record:
+            right_record = head
+            if right.repeats(state, head, steps, tape):
+                return Outcome(TRANSLATED, steps, tape=tape)
+        elif head < right.reach:
+            right.reach = head
+        if head < left_record:
+            left_record = head
+            if left.repeats(state, head, steps, tape):
+                return Outcome(TRANSLATED, steps, tape=tape)
+        elif head > left.reach:
+            left.reach = head
+    return Outcome(UNDECIDED, steps, tape=tape)
+
+
+class Enumeration:
+    # tree normal form: a table is only extended at the cell its run
+    # actually needs next, so unused cells are never enumerated. States
+    # and symbols are introduced in order of first use (renaming
+    # symmetry), the first move goes right (mirror symmetry) and every
+    # halting transition is the same canonical one
+    def __init__(
+        self,
+        state_value: int,
+        alph_value: int,
+        max_steps: int,
+        moves: str = "LR",
+        stack: list[Cells] | None = None,
+    ) -> None:
+        self.state_value = state_value
+        self.alph_value = alph_value
+        self.width = alph_value + 1
+        self.max_steps = max_steps
+        self.moves = [MOVES[name] for name in moves]
+        self.halt = [min(1, alph_value), self.moves[-1], HALT]
+        if stack is None:
+            stack = [[None] * (state_value * self.width)]
+        self.stack = stack
+
+    def children(self, cells: Cells, cell: int) -> list[Cells]:
+        state, code = cell // self.width + 1, cell % self.width
+        defined = [entry for entry in cells if entry is not None]
+        top_state = max([state] + [entry[2] for entry in defined])
+        top_code = max([code] + [entry[0] for entry in defined])
+        first = not defined
+        choices = [self.halt] if not first else []
+        for next_state in range(1, min(top_state + 1, self.state_value) + 1):
+            for val in range(min(top_code + 1, self.alph_value) + 1):
+                for step in self.moves:
+                    # Q1 moving on from a blank would only meet blanks
+                    if first and (step < 0 or step and next_state == 1):
+                        continue
+                    choices.append([val, step, next_state])
+        result = []
+        for choice in choices:
+            child = list(cells)
+            child[cell] = choice
+            result.append(child)
+        return result
+
+    def __iter__(self):
+        # depth first; self.stack is complete whenever a result is
+        # yielded, so it can be saved and resumed from there
+        while self.stack:
+            cells = self.stack.pop()
+            outcome = simulate(cells, self.width, self.max_steps)
+            if outcome.status == UNDEFINED:
+                self.stack.extend(reversed(self.children(cells, outcome.cell)))
+                continue
+            yield cells, outcome
+
+
+def compiled_table(
+    cells: Cells, state_value: int, alph_value: int
+) -> CompiledTable:
+    # cells the run never reached are left as halting ones
+    write, move, next_state = zip(*(
+        entry if entry is not None else (KEEP, 0, HALT) for entry in cells
+    ))
+    return CompiledTable(state_value, alph_value, write, move, next_state)
+
+
+class ShardWriter:
+    # newline-delimited JSON split into files of shard_size records; the
+    # position can be saved and restored, dropping anything written later
+    def __init__(self, directory: str, kind: str, shard_size: int) -> None:
+        self.directory = directory
+        self.kind = kind
+        self.shard_size = shard_size
+        self.index = 0
+        self.count = 0
+        self.file = None
+
+    def path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{self.kind}-{index:05d}.ndjson")
+
+    def position(self) -> dict:
+        if self.file is not None:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        offset = self.file.tell() if self.file is not None else 0
+        return {"index": self.index, "count": self.count, "offset": offset}
+
+    def restore(self, position: dict) -> None:
+        self.index = position["index"]
+        self.count = position["count"]
+        path = self.path(self.index)
+        if os.path.exists(path):
+            with open(path, "r+b") as f:
+                f.truncate(position["offset"])
+        later = self.index + 1
+        while os.path.exists(self.path(later)):
+            os.remove(self.path(later))
+            later += 1
+
+    def write(self, record: dict) -> None:
+        if self.count == self.shard_size:
+            self.close()
+            self.index += 1
+            self.count = 0
+        if self.file is None:
+            self.file = open(self.path(self.index), "a")
+        self.file.write(json.dumps(record) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def save_checkpoint(directory: str, checkpoint: dict) -> None:
+    # written next to the old one and renamed over it, so an interrupted
+    # save leaves the previous checkpoint intact
+    path = os.path.join(directory, CHECKPOINT)
+    with open(path + ".tmp", "w") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+
+def run_search(
+    directory: str,
+    state_value: int,
+    alph_value: int,
+    max_steps: int,
+    moves: str = "LR",
+    shard_size: int = 100000,
+    checkpoint_every: int = 10000,
+) -> dict:
+    params = {
+        "state_value": state_value,
+        "alph_value": alph_value,
+        "max_steps": max_steps,
+        "moves": moves,
+    }
+    os.makedirs(directory, exist_ok=True)
+    shards = {
+        kind: ShardWriter(directory, kind, shard_size)
+        for kind in (HALTED, UNDECIDED)
+    }
+    stats = {
+        HALTED: 0, LOOP: 0, TRANSLATED: 0, RUNAWAY: 0, UNDECIDED: 0,
+        "best_steps": 0,
+    }
+    stack = None
+    checkpoint_path = os.path.join(directory, CHECKPOINT)
+    if os.path.exists(checkpoint_path):
+        with open(checkpoint_path, "r") as f:
+            checkpoint = json.load(f)
+        if checkpoint["params"] != params:
+            raise ValueError(
+                f"{checkpoint_path} belongs to a search with different "
+                f"parameters: {checkpoint['params']}"
+            )
+        if checkpoint["done"]:
+            return checkpoint["stats"]
+        stack = checkpoint["stack"]
+        stats = checkpoint["stats"]
+        for kind, shard in shards.items():
+            shard.restore(checkpoint["shards"][kind])
+
+    enumeration = Enumeration(state_value, alph_value, max_steps, moves, stack)
+
+    def save(done: bool) -> None:
+        save_checkpoint(directory, {
+            "params": params,
+            "done": done,
+            "stats": stats,
+            "shards": {
+                kind: shard.position() for kind, shard in shards.items()
+            },
+            "stack": enumeration.stack,
+        })
+
+    since_checkpoint = 0
+    try:
+        for cells, outcome in enumeration:
+            # checkpoints from before a status was added don't count it yet
+            stats[outcome.status] = stats.get(outcome.status, 0) + 1
+            if outcome.status == HALTED:
+                stats["best_steps"] = max(stats["best_steps"], outcome.steps)
+            if outcome.status in shards:
+                shards[outcome.status].write({
+                    "status": outcome.status,
+                    "steps": outcome.steps,
+                    "nonblank": sum(
+                        code != BLANK for code in outcome.tape.to_list()
+                    ),
+                    "tape": format_tape(outcome.tape),
+                    "state_value": state_value,
+                    "alph_value": alph_value,
+                    "table_data": table_data(
+                        compiled_table(cells, state_value, alph_value)
+                    ),
+                })
+            since_checkpoint += 1
+            if since_checkpoint == checkpoint_every:
+                save(False)
+                since_checkpoint = 0
+        save(True)
+    finally:
+        for shard in shards.values():
+            shard.close()
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Enumerate and run every machine of a given size"
+    )
+    parser.add_argument("state_value", type=int)
+    parser.add_argument("alph_value", type=int)
+    parser.add_argument(
+        "directory", help="output shards and checkpoint; resumed if present"
+    )
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument(
+        "--moves", choices=["LR", "LRS"], default="LR",
+        help="head moves to enumerate",
+    )
+    parser.add_argument("--shard-size", type=int, default=100000)
+    parser.add_argument("--checkpoint-every", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    try:
+        stats = run_search(
+            args.directory,
+            args.state_value,
+            args.alph_value,
+            args.max_steps,
+            args.moves,
+            args.shard_size,
+            args.checkpoint_every,
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"{args.directory}: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
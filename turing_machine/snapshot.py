@@ -0,0 +1,209 @@
+import json
+import mmap
+import struct
+from array import array
+
+from tape import (
+    TAPE_MODES,
+    ArrayTape,
+    RLETape,
+    SparseTape,
+    Tape,
+    code_symbol,
+    make_tape,
+    symbol_code,
+)
+
+
+MAGIC = b"TMSNAP\0\0"
+VERSION = 2
+SUFFIX = ".tms"
+# version, cell size, state_value, alph_value, current_table_state,
+# head (relative to the first stored cell), tape length, meta length;
+# cell size 0 stores the tape as runs (uint64 lengths, then uint16 codes)
+# and the tape length field holds the number of runs
+HEADER = struct.Struct("<HHIIIqQI")
+ALIGN = 8
+WRITE_CHUNK = 1 << 20
+
+FILE_FILTER = "JSON Files (*.json);;Snapshots (*.tms);;All Files (*)"
+
+
+def _cells_bytes(tape: Tape, cell_size: int):
+    if cell_size == 1 and isinstance(tape, ArrayTape):
+        return memoryview(tape.buffer)
+    if cell_size == 1:
+        return bytes(tape.to_list())
+    return array("H", tape.to_list()).tobytes()
+
+
+def _report(progress, done: int, total: int) -> None:
+    if progress is not None:
+        progress(100 * done // total if total else 100)
+
+
+def write_snapshot(file_path: str, data: dict, progress=None) -> None:
+    tape = data["tape"]
+    if isinstance(tape, RLETape):
+        cell_size = 0
+        lengths, codes = tape.runs()
+        length = len(lengths)
+        body = array("Q", lengths).tobytes() + array("H", codes).tobytes()
+    else:
+        cell_size = 1 if data["alph_value"] < 256 else 2
+        length = len(tape)
+        body = _cells_bytes(tape, cell_size)
+    meta = json.dumps({
+        "table_data": data["table_data"],
+        "is_ready_to_start": data.get("is_ready_to_start", True),
+        "is_on": data.get("is_on", False),
+        "tape_mode": data.get("tape_mode", "array"),
+    }).encode()
+    header = MAGIC + HEADER.pack(
+        VERSION,
+        cell_size,
+        data["state_value"],
+        data["alph_value"],
+        data["current_table_state"],
+        data["current_tape_cell"] - tape.lo,
+        length,
+        len(meta),
+    )
+    padding = -(len(header) + len(meta)) % ALIGN
+    with open(file_path, "wb") as f:
+        f.write(header)
+        f.write(meta)
+        f.write(bytes(padding))
+        body = memoryview(body).cast("B")
+        for start in range(0, len(body), WRITE_CHUNK):
+            f.write(body[start:start + WRITE_CHUNK])
+            _report(progress, start, len(body))
+    _report(progress, 1, 1)
+
+
+def write_json(file_path: str, data: dict, progress=None) -> None:
+    # the fields of save_data with the tape as a list of symbols and the
+    # head relative to its first cell; the tape is converted and written a
+    # chunk at a time
+    tape = data["tape"]
+    fields = {
+        key: value for key, value in data.items()
+        if key not in ("tape", "current_tape_cell")
+    }
+    fields["current_tape_cell"] = data["current_tape_cell"] - tape.lo
+    with open(file_path, "w") as f:
+        f.write(json.dumps(fields)[:-1] + ', "tape": [')
+        for lo in range(tape.lo, tape.hi, WRITE_CHUNK):
+            hi = min(lo + WRITE_CHUNK, tape.hi)
+            symbols = [code_symbol(code) for code in tape.cells(lo, hi)]
+            if lo > tape.lo:
+                f.write(", ")
+            f.write(json.dumps(symbols)[1:-1])
+            _report(progress, hi - tape.lo, len(tape))
+        f.write("]}")
+    _report(progress, 1, 1)
+
+
+def save_machine_data(file_path: str, data: dict, progress=None) -> None:
+    if file_path.endswith(SUFFIX):
+        write_snapshot(file_path, data, progress)
+    else:
+        write_json(file_path, data, progress)
+
+
+def is_snapshot(file_path: str) -> bool:
+    with open(file_path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class Snapshot:
+    # read-only view of a snapshot file; `cells` is a memoryview straight
+    # over the mapped file, so nothing is copied until a Tape is built
+    def __init__(self, file_path: str) -> None:
+        with open(file_path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views = [memoryview(self.mmap)]
+        view = self.views[0]
+        if view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{file_path} is not a machine snapshot")
+        (
+            version,
+            self.cell_size,
+            self.state_value,
+            self.alph_value,
+            self.current_table_state,
+            self.head,
+            length,
+            meta_length,
+        ) = HEADER.unpack_from(view, len(MAGIC))
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version}")
+        start = len(MAGIC) + HEADER.size
+        self.meta = json.loads(bytes(view[start:start + meta_length]))
+        start += meta_length
+        start += -start % ALIGN
+        if self.cell_size == 0:
+            # memoryview.cast needs the base offset aligned to the item size
+            lengths = view[start:start + length * 8]
+            codes = view[start + length * 8:start + length * 10]
+            self.views += [lengths, codes, lengths.cast("Q"), codes.cast("H")]
+            self.runs = self.views[-2], self.views[-1]
+            self.cells = None
+            return
+        self.views.append(view[start:start + length * self.cell_size])
+        if self.cell_size == 2:
+            self.views.append(self.views[-1].cast("H"))
+        self.cells = self.views[-1]
+
+    def to_tape(self) -> Tape:
+        mode = self.meta["tape_mode"]
+        if self.cell_size == 0:
+            return RLETape.from_runs(*self.runs)
+        if mode == "array" and self.cell_size != 1:
+            return SparseTape(self.cells)
+        return TAPE_MODES[mode](self.cells)
+
+    def to_dict(self) -> dict:
+        return {
+            "state_value": self.state_value,
+            "alph_value": self.alph_value,
+            "current_table_state": self.current_table_state,
+            "tape": self.to_tape(),
+            "current_tape_cell": self.head,
+            **self.meta,
+        }
+
+    def close(self) -> None:
+        for view in reversed(self.views):
+            view.release()
+        self.mmap.close()
+
+
+def load_machine_data(file_path: str) -> dict:
+    # accepts both binary snapshots and the JSON files save_to_file writes
+    if not is_snapshot(file_path):
+        with open(file_path, "r") as f:
+            return json.load(f)
+    snapshot = Snapshot(file_path)
+    try:
+        return snapshot.to_dict()
+    finally:
+        snapshot.close()
+
+
+def load_machine(file_path: str, progress=None) -> dict:
+    # like load_machine_data, but the tape always comes back as a Tape, so
+    # the expensive conversion can run off the GUI thread
+    _report(progress, 0, 1)
+    data = load_machine_data(file_path)
+    _report(progress, 1, 2)
+    if not isinstance(data["tape"], Tape):
+        data["tape"] = make_tape(
+            [symbol_code(value) for value in data["tape"]],
+            data.get("tape_mode", "array"),
+            alph_value=data["alph_value"],
+        )
+    _report(progress, 1, 1)
+    return data
@@ -0,0 +1,114 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QBrush, QColor
+
+from app import TuringMachineApp
+from engine import compile_command
+
+
+class TransitionTableModel(QAbstractTableModel):
+    # the transition table straight over TuringMachineApp.table_data; the
+    # view only asks for the cells it paints, and edits go through
+    # set_table_cell, so only the edited cell is compiled again; errors are
+    # checked per painted cell, so opening a machine compiles nothing
+    def __init__(self, machine: TuringMachineApp, parent=None) -> None:
+        super().__init__(parent)
+        self.machine = machine
+        self.heatmap: list[list[int]] = []
+        self.peak = 0
+
+    def set_machine(self, machine: TuringMachineApp) -> None:
+        self.beginResetModel()
+        self.machine = machine
+        self.heatmap = []
+        self.peak = 0
+        self.endResetModel()
+
+    def set_heatmap(self, heatmap: list[list[int]]) -> None:
+        self.heatmap = heatmap
+        self.peak = max(map(max, heatmap), default=0)
+        if self.rowCount() and self.columnCount():
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(self.rowCount() - 1, self.columnCount() - 1),
+                [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole],
+            )
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.machine.state_value
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.machine.alph_value + 1
+
+    def command(self, row: int, col: int) -> str:
+        table_data = self.machine.table_data
+        row_data = table_data[row] if row < len(table_data) else []
+        return row_data[col] if col < len(row_data) else ""
+
+    def error(self, row: int, col: int) -> str | None:
+        try:
+            compile_command(
+                self.command(row, col),
+                self.machine.state_value,
+                self.machine.alph_value,
+            )
+        except ValueError as e:
+            return str(e)
+        return None
+
+    def heat(self, row: int, col: int) -> int | None:
+        if not self.peak or row >= len(self.heatmap):
+            return None
+        return self.heatmap[row][col]
+
+    def data(
+        self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
+    ):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.command(row, col)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if self.error(row, col) is not None:
+                return QBrush(QColor(200, 0, 0))
+            return None
+        heat = self.heat(row, col)
+        if role == Qt.ItemDataRole.BackgroundRole and heat is not None:
+            fade = int(255 * (1 - heat / self.peak))
+            return QBrush(QColor(255, fade, fade))
+        if role == Qt.ItemDataRole.ToolTipRole:
+            error = self.error(row, col)
+            if error is not None:
+                return error
+            return None if heat is None else str(heat)
+        return None
+
+    def setData(
+        self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole
+    ) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        self.machine.set_table_cell(index.row(), index.column(), str(value))
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (
+            Qt.ItemFlag.ItemIsEnabled
+            | Qt.ItemFlag.ItemIsSelectable
+            | Qt.ItemFlag.ItemIsEditable
+        )
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return "_" if section == 0 else str(section - 1)
+        return f"Q{section + 1}"
@@ -0,0 +1,446 @@
+import re
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+
+
+BLANK = 0
+# ArrayTape keeps a cell in a byte: blank and digits up to 254
+MAX_ARRAY_ALPH = 255
+# cells Tape.used packs at a time while it looks for the ends
+SCAN_CELLS = 1 << 20
+
+
+def symbol_code(value: str | int) -> int:
+    if value == "_":
+        return BLANK
+    return int(value) + 1
+
+
+def code_symbol(code: int) -> str | int:
+    if code == BLANK:
+        return "_"
+    return code - 1
+
+
+class Tape(ABC):
+    lo: int
+    hi: int
+
+    @abstractmethod
+    def __getitem__(self, pos: int) -> int:
+        ...
+
+    @abstractmethod
+    def __setitem__(self, pos: int, code: int) -> None:
+        ...
+
+    @abstractmethod
+    def ensure(self, pos: int) -> None:
+        ...
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def cells(self, lo: int, hi: int) -> list[int]:
+        return [self[pos] for pos in range(lo, hi)]
+
+    def to_list(self) -> list[int]:
+        return self.cells(self.lo, self.hi)
+
+    def packed(self, lo: int, hi: int) -> bytes:
+        # one byte per cell, blank outside the tape
+        start, end = max(lo, self.lo), min(hi, self.hi)
+        if start >= end:
+            return bytes(hi - lo)
+        return (
+            bytes(start - lo) + bytes(self.cells(start, end))
+            + bytes(hi - end)
+        )
+
+    def used(self) -> tuple[int, int]:
+        # first and past-the-last non-blank cell, (0, 0) if there are none;
+        # packed a chunk at a time from both ends, so codes must fit a byte
+        lo = self.lo
+        while lo < self.hi:
+            data = self.packed(lo, min(lo + SCAN_CELLS, self.hi))
+            blanks = len(data) - len(data.lstrip(b"\0"))
+            lo += blanks
+            if blanks < len(data):
+                break
+        else:
+            return 0, 0
+        hi = self.hi
+        while True:
+            data = self.packed(max(hi - SCAN_CELLS, lo), hi)
+            blanks = len(data) - len(data.rstrip(b"\0"))
+            hi -= blanks
+            if blanks < len(data):
+                return lo, hi
+
+    def copy(self) -> "Tape":
+        return type(self)(self.to_list(), self.lo)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self)
+
+
+class ArrayTape(Tape):
+    CHUNK = 16
+
+    def __init__(self, cells=(), origin: int = 0) -> None:
+        self.buffer = bytearray(cells)
+        self.offset = -origin
+
+    @property
+    def lo(self) -> int:
+        return -self.offset
+
+    @property
+    def hi(self) -> int:
+        return len(self.buffer) - self.offset
+
+    def __getitem__(self, pos: int) -> int:
+        inx = pos + self.offset
+        if 0 <= inx < len(self.buffer):
+            return self.buffer[inx]
+        return BLANK
+
+    def __setitem__(self, pos: int, code: int) -> None:
+        self.ensure(pos)
+        self.buffer[pos + self.offset] = code
+
+    def ensure(self, pos: int) -> None:
+        # keep one cell of margin around pos and double the buffer on
+        # growth, so extension is amortized O(1) in both directions
+        inx = pos + self.offset
+        if inx <= 0:
+            extra = max(self.CHUNK, len(self.buffer), 1 - inx)
+            self.buffer[:0] = bytes(extra)
+            self.offset += extra
+            inx += extra
+        if inx + 1 >= len(self.buffer):
+            size = len(self.buffer)
+            extra = max(self.CHUNK, size, inx + 2 - size)
+            self.buffer.extend(bytes(extra))
+
+    def cells(self, lo: int, hi: int) -> list[int]:
+        if lo >= self.lo and hi <= self.hi:
+            return list(self.buffer[lo + self.offset:hi + self.offset])
+        return super().cells(lo, hi)
+
+    def packed(self, lo: int, hi: int) -> bytes:
+        start, end = max(lo, self.lo), min(hi, self.hi)
+        if start >= end:
+            return bytes(hi - lo)
+        return (
+            bytes(start - lo)
+            + self.buffer[start + self.offset:end + self.offset]
+            + bytes(hi - end)
+        )
+
+    def copy(self) -> "ArrayTape":
+        tape = ArrayTape(self.buffer)
+        tape.offset = self.offset
+        return tape
+
+
+class SparseTape(Tape):
+    def __init__(self, cells=(), origin: int = 0) -> None:
+        self.data = {
+            origin + i: code for i, code in enumerate(cells) if code != BLANK
+        }
+        self.lo = origin
+        self.hi = origin + len(cells)
+
+    def __getitem__(self, pos: int) -> int:
+        return self.data.get(pos, BLANK)
+
+    def __setitem__(self, pos: int, code: int) -> None:
+        self.ensure(pos)
+        if code == BLANK:
+            self.data.pop(pos, None)
+        else:
+            self.data[pos] = code
+
+    def ensure(self, pos: int) -> None:
+        if pos - 1 < self.lo:
+            self.lo = pos - 1
+        if pos + 2 > self.hi:
+            self.hi = pos + 2
+
+    def used(self) -> tuple[int, int]:
+        if not self.data:
+            return 0, 0
+        return min(self.data), max(self.data) + 1
+
+    def packed(self, lo: int, hi: int) -> bytes:
+        # only the written cells are looked at, so a few symbols far apart
+        # cost no more than the blank bytes between them
+        data = self.data
+        result = bytearray(hi - lo)
+        if len(data) < hi - lo:
+            for pos, code in data.items():
+                if lo <= pos < hi:
+                    result[pos - lo] = code
+        else:
+            for pos in range(lo, hi):
+                code = data.get(pos)
+                if code is not None:
+                    result[pos - lo] = code
+        return bytes(result)
+
+    def copy(self) -> "SparseTape":
+        tape = SparseTape((), self.lo)
+        tape.data = dict(self.data)
+        tape.hi = self.hi
+        return tape
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) * 100
+
+
+class RLETape(Tape):
+    # runs of equal cells: run i covers starts[i] up to the next start (or
+    # hi); lookups bisect the starts and remember the last run hit, so the
+    # head walking along a run costs O(1)
+    def __init__(self, cells=(), origin: int = 0) -> None:
+        self.starts: list[int] = []
+        self.codes: list[int] = []
+        self.lo = origin
+        self.hi = origin
+        self.last = 0
+        for code in cells:
+            if not self.codes or self.codes[-1] != code:
+                self.starts.append(self.hi)
+                self.codes.append(code)
+            self.hi += 1
+
+    @classmethod
+    def from_runs(cls, lengths, codes, origin: int = 0) -> "RLETape":
+        tape = cls((), origin)
+        for length, code in zip(lengths, codes):
+            if not length:
+                continue
+            if tape.codes and tape.codes[-1] == code:
+                tape.hi += length
+                continue
+            tape.starts.append(tape.hi)
+            tape.codes.append(code)
+            tape.hi += length
+        return tape
+
+    @classmethod
+    def from_packed(cls, data: bytes, origin: int = 0) -> "RLETape":
+        # a run ends at the first other byte, which a regex character class
+        # finds in C, so a long run costs no Python loop over its cells
+        lengths, codes = [], []
+        pos = 0
+        while pos < len(data):
+            code = data[pos]
+            other = re.compile(b"[^" + re.escape(bytes([code])) + b"]")
+            match = other.search(data, pos)
+            end = match.start() if match else len(data)
+            lengths.append(end - pos)
+            codes.append(code)
+            pos = end
+        return cls.from_runs(lengths, codes, origin)
+
+    def runs(self) -> tuple[list[int], list[int]]:
+        ends = self.starts[1:] + [self.hi]
+        return (
+            [end - start for start, end in zip(self.starts, ends)],
+            list(self.codes),
+        )
+
+    def __find(self, pos: int) -> int:
+        starts = self.starts
+        last = self.last
+        if last < len(starts) and starts[last] <= pos and (
+            last + 1 == len(starts) or pos < starts[last + 1]
+        ):
+            return last
+        self.last = bisect_right(starts, pos) - 1
+        return self.last
+
+    def __getitem__(self, pos: int) -> int:
+        if not self.lo <= pos < self.hi:
+            return BLANK
+        return self.codes[self.__find(pos)]
+
+    def __setitem__(self, pos: int, code: int) -> None:
+        self.ensure(pos)
+        starts, codes = self.starts, self.codes
+        inx = self.__find(pos)
+        old = codes[inx]
+        if old == code:
+            return
+        end = starts[inx + 1] if inx + 1 < len(starts) else self.hi
+        has_left = pos > starts[inx]
+        has_right = pos + 1 < end
+        new_starts = [pos]
+        new_codes = [code]
+        if has_left:
+            new_starts.insert(0, starts[inx])
+            new_codes.insert(0, old)
+        if has_right:
+            new_starts.append(pos + 1)
+            new_codes.append(old)
+        starts[inx:inx + 1] = new_starts
+        codes[inx:inx + 1] = new_codes
+        inx += has_left
+        # merge the new single-cell run with equal neighbours
+        if not has_right and inx + 1 < len(codes) and codes[inx + 1] == code:
+            del starts[inx + 1], codes[inx + 1]
+        if not has_left and inx > 0 and codes[inx - 1] == code:
+            del starts[inx], codes[inx]
+            inx -= 1
+        self.last = inx
+
+    def ensure(self, pos: int) -> None:
+        if pos - 1 < self.lo:
+            self.lo = pos - 1
+            if self.codes and self.codes[0] == BLANK:
+                self.starts[0] = self.lo
+            else:
+                self.starts.insert(0, self.lo)
+                self.codes.insert(0, BLANK)
+                self.last += 1
+        if pos + 2 > self.hi:
+            if not self.codes or self.codes[-1] != BLANK:
+                self.starts.append(self.hi)
+                self.codes.append(BLANK)
+            self.hi = pos + 2
+
+    def used(self) -> tuple[int, int]:
+        # runs merge, so blank runs at the ends are at most one each
+        starts, codes = self.starts, self.codes
+        first = 1 if codes and codes[0] == BLANK else 0
+        last = len(codes) - (1 if codes and codes[-1] == BLANK else 0)
+        if first >= last:
+            return 0, 0
+        end = starts[last] if last < len(starts) else self.hi
+        return starts[first], end
+
+    def cells(self, lo: int, hi: int) -> list[int]:
+        result = []
+        if lo < self.lo:
+            result.extend([BLANK] * (min(hi, self.lo) - lo))
+            lo = self.lo
+        if lo < min(hi, self.hi):
+            inx = bisect_right(self.starts, lo) - 1
+            while lo < min(hi, self.hi):
+                end = self.starts[inx + 1] if inx + 1 < len(self.starts) \
+                    else self.hi
+                end = min(end, hi)
+                result.extend([self.codes[inx]] * (end - lo))
+                lo = end
+                inx += 1
+        if lo < hi:
+            result.extend([BLANK] * (hi - lo))
+        return result
+
+    def packed(self, lo: int, hi: int) -> bytes:
+        # a run at a time, so the cost is in runs rather than cells
+        start, end = max(lo, self.lo), min(hi, self.hi)
+        if start >= end:
+            return bytes(hi - lo)
+        starts, codes = self.starts, self.codes
+        result = bytearray(start - lo)
+        inx = bisect_right(starts, start) - 1
+        while start < end:
+            run_end = starts[inx + 1] if inx + 1 < len(starts) else self.hi
+            run_end = min(run_end, end)
+            code = codes[inx]
+            if code == BLANK:
+                result += bytes(run_end - start)
+            else:
+                result += bytes([code]) * (run_end - start)
+            start = run_end
+            inx += 1
+        result += bytes(hi - end)
+        return bytes(result)
+
+    def copy(self) -> "RLETape":
+        tape = RLETape((), self.lo)
+        tape.starts = list(self.starts)
+        tape.codes = list(self.codes)
+        tape.hi = self.hi
+        return tape
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.starts) * 64
+
+
+class TapeWindow(Tape):
+    # read-only copy of cells start..start+len(data) of a tape spanning
+    # lo..hi; cells outside the copied window read as blank
+    def __init__(
+        self, lo: int, hi: int, start: int, data: tuple[int, ...]
+    ) -> None:
+        self.lo = lo
+        self.hi = hi
+        self.start = start
+        self.data = data
+
+    def __getitem__(self, pos: int) -> int:
+        inx = pos - self.start
+        if 0 <= inx < len(self.data):
+            return self.data[inx]
+        return BLANK
+
+    def __setitem__(self, pos: int, code: int) -> None:
+        raise TypeError("TapeWindow is read-only")
+
+    def ensure(self, pos: int) -> None:
+        raise TypeError("TapeWindow is read-only")
+
+    def cells(self, lo: int, hi: int) -> list[int]:
+        start = self.start
+        if lo >= start and hi <= start + len(self.data):
+            return list(self.data[lo - start:hi - start])
+        return super().cells(lo, hi)
+
+
+def format_tape(tape: Tape) -> str:
+    # only the used span; RLE tapes a run at a time, so a long run costs
+    # one string repeat instead of a Python step per cell
+    lo, hi = tape.used()
+    if lo == hi:
+        return "_"
+    if isinstance(tape, RLETape):
+        parts = []
+        pos = tape.lo
+        for length, code in zip(*tape.runs()):
+            count = min(pos + length, hi) - max(pos, lo)
+            if count > 0:
+                parts.append(f"{code_symbol(code)} " * count)
+            pos += length
+        return "".join(parts)[:-1]
+    cells = tape.cells(lo, hi)
+    symbols = {code: str(code_symbol(code)) for code in set(cells)}
+    return " ".join(map(symbols.__getitem__, cells))
+
+
+TAPE_MODES = {"array": ArrayTape, "sparse": SparseTape, "rle": RLETape}
+
+
+def make_tape(
+    cells=(),
+    mode: str = "array",
+    origin: int = 0,
+    alph_value: int | None = None,
+) -> Tape:
+    # codes past a byte don't fit ArrayTape; such machines get a SparseTape,
+    # as snapshots with two-byte cells do
+    if mode == "array" and alph_value is not None and (
+        alph_value > MAX_ARRAY_ALPH
+    ):
+        mode = "sparse"
+    try:
+        tape_cls = TAPE_MODES[mode]
+    except KeyError:
+        raise ValueError(f"Unknown tape mode {mode}")
+    return tape_cls(cells, origin)
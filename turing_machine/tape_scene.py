@@ -0,0 +1,115 @@
+from math import floor
+
+from PyQt6.QtWidgets import (
+    QGraphicsScene,
+    QGraphicsTextItem,
+    QGraphicsRectItem,
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+
+from tape import BLANK, Tape, code_symbol
+
+
+# cells the scene spans either side of its origin; Qt's scroll bars are
+# ints, so a whole long tape in pixels would overflow them
+SCENE_CELLS = 1 << 20
+
+
+class TapeScene(QGraphicsScene):
+    # cell pos is drawn at x (pos - origin) * cell_size; the origin moves
+    # when the view gets close to the edge of the scene
+    def __init__(self, cell_size: int, parent=None) -> None:
+        super().__init__(parent)
+        self.cell_size = cell_size
+        self.font = QFont("Times New Roman", 40)
+        self.font.setBold(True)
+        # pos -> [rect_item, text_item, code, is_head]
+        self.cells: dict[int, list] = {}
+        self.pool: list[list] = []
+        self.origin = 0
+        self.span = (0, 0)
+
+    def x_of(self, pos: int) -> float:
+        return (pos - self.origin) * self.cell_size
+
+    def cell_at(self, x: float) -> int:
+        return floor(x / self.cell_size) + self.origin
+
+    def off_center(self, pos: int) -> bool:
+        return abs(pos - self.origin) > SCENE_CELLS // 2
+
+    def recenter(self, pos: int) -> None:
+        self.origin = pos
+        for cell in list(self.cells):
+            self.__release(cell)
+        self.__set_rect()
+
+    def __set_rect(self) -> None:
+        lo = max(self.span[0], self.origin - SCENE_CELLS)
+        hi = max(min(self.span[1], self.origin + SCENE_CELLS), lo)
+        self.setSceneRect(
+            self.x_of(lo), 0, (hi - lo) * self.cell_size, self.cell_size
+        )
+
+    def refresh(self, tape: Tape, head: int, lo: int, hi: int) -> None:
+        if self.span != (tape.lo, tape.hi):
+            self.span = tape.lo, tape.hi
+            self.__set_rect()
+        lo = max(lo, tape.lo)
+        hi = min(hi, tape.hi)
+
+        for pos in [pos for pos in self.cells if not lo <= pos < hi]:
+            self.__release(pos)
+
+        cells = tape.cells(lo, hi) if lo < hi else []
+        for pos, code in enumerate(cells, lo):
+            entry = self.cells.get(pos)
+            if entry is None:
+                entry = self.__acquire(pos)
+            is_head = pos == head
+            if entry[2] != code or entry[3] != is_head:
+                self.__paint(pos, entry, code, is_head)
+
+    def __acquire(self, pos: int) -> list:
+        if self.pool:
+            entry = self.pool.pop()
+            entry[0].show()
+            entry[1].show()
+        else:
+            rect_item = QGraphicsRectItem(0, 0, self.cell_size, self.cell_size)
+            text_item = QGraphicsTextItem()
+            text_item.setFont(self.font)
+            self.addItem(rect_item)
+            self.addItem(text_item)
+            entry = [rect_item, text_item, None, None]
+        entry[0].setPos(self.x_of(pos), 0)
+        entry[2] = None
+        self.cells[pos] = entry
+        return entry
+
+    def __release(self, pos: int) -> None:
+        entry = self.cells.pop(pos)
+        entry[0].hide()
+        entry[1].hide()
+        self.pool.append(entry)
+
+    def __paint(self, pos: int, entry: list, code: int, is_head: bool) -> None:
+        rect_item, text_item = entry[0], entry[1]
+        if is_head:
+            rect_item.setBrush(Qt.GlobalColor.red)
+        else:
+            rect_item.setBrush(
+                Qt.GlobalColor.gray if code != BLANK
+                else Qt.GlobalColor.black
+            )
+        if entry[2] != code:
+            text_item.setPlainText(str(code_symbol(code)))
+            text_item.adjustSize()
+            text_item.setPos(
+                self.x_of(pos) + self.cell_size/2 -
+                text_item.boundingRect().width()/2,
+                self.cell_size/2 - text_item.boundingRect().height()/2
+            )
+        entry[2] = code
+        entry[3] = is_head
@@ -0,0 +1,172 @@
+import json
+import struct
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from engine import HALT, KEEP, Engine
+from tape import code_symbol
+
+
+MAGIC = b"TMTRACE\0"
+VERSION = 1
+SUFFIX = ".tmt"
+FILE_FILTER = "Traces (*.tmt);;JSON Lines (*.ndjson);;All Files (*)"
+# every chunk is a (first step, record count) header followed by columns
+# of heads (int64), states (uint32), read and written codes (uint16)
+CHUNK_HEADER = struct.Struct("<QI")
+VERSION_HEADER = struct.Struct("<H")
+CHUNK_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class TraceChunk:
+    # record i is the step taken from step first_step + i: the state and
+    # head before it, the code it read and the code left in that cell
+    first_step: int
+    heads: array
+    states: array
+    reads: array
+    writes: array
+
+    def __len__(self) -> int:
+        return len(self.heads)
+
+    def records(self) -> Iterator[tuple[int, int, int, int, int]]:
+        for inx in range(len(self.heads)):
+            yield (
+                self.first_step + inx,
+                self.states[inx],
+                self.heads[inx],
+                self.reads[inx],
+                self.writes[inx],
+            )
+
+
+def trace_chunks(
+    engine: Engine, max_steps: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[TraceChunk]:
+    # runs the engine and yields its trace a chunk at a time; the engine
+    # is up to date whenever a chunk is handed out, and nothing is kept
+    # once the consumer drops the chunk
+    table = engine.table
+    write, move, next_state = table.write, table.move, table.next_state
+    width = table.width
+    tape = engine.tape
+    done = 0
+    while done < max_steps and not engine.halted:
+        chunk = TraceChunk(
+            engine.steps, array("q"), array("I"), array("H"), array("H")
+        )
+        heads, states = chunk.heads, chunk.states
+        reads, writes = chunk.reads, chunk.writes
+        head = engine.head
+        state = engine.state
+        count = min(chunk_size, max_steps - done)
+        taken = 0
+        while taken < count and state != HALT:
+            code = tape[head]
+            cell = (state - 1) * width + code
+            val = write[cell]
+            if val == KEEP:
+                val = code
+            else:
+                tape[head] = val
+            heads.append(head)
+            states.append(state)
+            reads.append(code)
+            writes.append(val)
+            head += move[cell]
+            state = next_state[cell]
+            tape.ensure(head)
+            taken += 1
+        engine.head = head
+        engine.state = state
+        engine.steps += taken
+        done += taken
+        yield chunk
+
+
+class TraceWriter:
+    # binary chunks for .tmt files, one JSON object per step otherwise
+    def __init__(self, file_path: str) -> None:
+        self.binary = file_path.endswith(SUFFIX)
+        if self.binary:
+            self.file = open(file_path, "wb")
+            self.file.write(MAGIC + VERSION_HEADER.pack(VERSION))
+        else:
+            self.file = open(file_path, "w")
+        self.symbols: dict[int, str] = {}
+        self.records = 0
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __symbol(self, code: int) -> str:
+        if code not in self.symbols:
+            self.symbols[code] = json.dumps(code_symbol(code))
+        return self.symbols[code]
+
+    def write(self, chunk: TraceChunk) -> None:
+        self.records += len(chunk)
+        if self.binary:
+            self.file.write(CHUNK_HEADER.pack(chunk.first_step, len(chunk)))
+            for column in (
+                chunk.heads, chunk.states, chunk.reads, chunk.writes
+            ):
+                self.file.write(column.tobytes())
+            return
+        symbol = self.__symbol
+        self.file.write("".join(
+            f'{{"step": {step}, "state": {state}, "head": {head}, '
+            f'"read": {symbol(read)}, "written": {symbol(written)}}}\n'
+            for step, state, head, read, written in chunk.records()
+        ))
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def write_trace(
+    file_path: str,
+    engine: Engine,
+    max_steps: int,
+    chunk_size: int = CHUNK_SIZE,
+    progress=None,
+) -> int:
+    with TraceWriter(file_path) as writer:
+        for chunk in trace_chunks(engine, max_steps, chunk_size):
+            writer.write(chunk)
+            if progress is not None:
+                progress(
+                    100 * writer.records // max_steps if max_steps else 100
+                )
+    return writer.records
+
+
+def _read_column(f, typecode: str, count: int) -> array:
+    column = array(typecode)
+    column.frombytes(f.read(count * column.itemsize))
+    return column
+
+
+def read_trace(file_path: str) -> Iterator[TraceChunk]:
+    # chunks back from a .tmt file, one chunk in memory at a time
+    with open(file_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{file_path} is not a binary trace")
+        (version,) = VERSION_HEADER.unpack(f.read(VERSION_HEADER.size))
+        if version > VERSION:
+            raise ValueError(f"Unsupported trace version {version}")
+        while header := f.read(CHUNK_HEADER.size):
+            first_step, count = CHUNK_HEADER.unpack(header)
+            yield TraceChunk(
+                first_step,
+                _read_column(f, "q", count),
+                _read_column(f, "I", count),
+                _read_column(f, "H", count),
+                _read_column(f, "H", count),
+            )
@@ -0,0 +1,137 @@
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+import numpy as np
+
+from engine import HALT, KEEP, CompiledTable
+from tape import ArrayTape, Tape, format_tape, make_tape, symbol_code
+
+
+CHECK_EVERY = 64
+
+
+def stack_tables(tables: list[CompiledTable]) -> np.ndarray:
+    # (3, tables, states * symbols): write, move and next state planes
+    shapes = {(table.state_value, table.alph_value) for table in tables}
+    if len(shapes) != 1:
+        raise ValueError("All tables must have the same size")
+    return np.array(
+        [[table.write, table.move, table.next_state] for table in tables],
+        dtype=np.int32,
+    ).transpose(1, 0, 2)
+
+
+class VectorEngine:
+    def __init__(
+        self,
+        tables: list[CompiledTable],
+        tapes: list[list[int]],
+        heads: list[int],
+        states: list[int] | None = None,
+        table_ids: list[int] | None = None,
+    ) -> None:
+        count = len(tapes)
+        self.width = tables[0].width
+        self.alph_value = tables[0].alph_value
+        self.cells = stack_tables(tables)
+        self.table_ids = np.asarray(
+            table_ids if table_ids is not None else [0] * count,
+            dtype=np.int64,
+        )
+        # all tapes share one matrix; position 0 of every input tape is
+        # stored at column `origin`. Cells are bytes unless the alphabet
+        # needs wider ones
+        length = max(len(tape) for tape in tapes) + 2
+        self.origin = 1
+        self.tapes = np.zeros(
+            (count, length), dtype=np.min_scalar_type(self.alph_value)
+        )
+        for row, tape in enumerate(tapes):
+            self.tapes[row, 1:len(tape) + 1] = tape
+        self.heads = np.asarray(heads, dtype=np.int64) + self.origin
+        self.states = np.asarray(
+            states if states is not None else [1] * count, dtype=np.int64
+        )
+        self.steps = np.zeros(count, dtype=np.int64)
+        self.rows = np.arange(count)
+        self.__grow()
+
+    @property
+    def halted(self) -> np.ndarray:
+        return self.states == HALT
+
+    def __grow(self) -> None:
+        low = self.heads.min(initial=1) <= 0
+        high = self.heads.max(initial=0) + 1 >= self.tapes.shape[1]
+        if not (low or high):
+            return
+        extra = self.tapes.shape[1]
+        self.tapes = np.pad(
+            self.tapes, ((0, 0), (extra if low else 0, extra if high else 0))
+        )
+        if low:
+            self.origin += extra
+            self.heads += extra
+
+    def run(self, max_steps: int) -> int:
+        write, move, next_state = self.cells
+        stride = write.shape[1]
+        base = self.table_ids * stride
+        rows = self.rows
+        done = 0
+        while done < max_steps:
+            if done % CHECK_EVERY == 0 and self.halted.all():
+                break
+            active = self.states != HALT
+            codes = self.tapes[rows, self.heads]
+            flat = base + (self.states - 1) * self.width + codes
+            flat[~active] = 0
+            val = write.take(flat)
+            val = np.where(active & (val != KEEP), val, codes)
+            self.tapes[rows, self.heads] = val
+            self.heads += np.where(active, move.take(flat), 0)
+            self.states = np.where(active, next_state.take(flat), HALT)
+            self.steps += active
+            done += 1
+            self.__grow()
+        return done
+
+    def tape(self, row: int) -> Tape:
+        if self.tapes.dtype != np.uint8:
+            return make_tape(
+                self.tapes[row].tolist(), origin=-self.origin,
+                alph_value=self.alph_value,
+            )
+        return ArrayTape(self.tapes[row].tobytes(), -self.origin)
+
+    def head(self, row: int) -> int:
+        return int(self.heads[row]) - self.origin
+
+
+def run_many_vectorized(
+    table: CompiledTable,
+    inputs: Iterable[list],
+    max_steps: int,
+    head: int | None = None,
+    block_size: int = 4096,
+) -> Iterator[dict]:
+    # same results as batch.run_many, computed a block of inputs at a time
+    inputs = iter(inputs)
+    while block := list(islice(inputs, block_size)):
+        tapes = [
+            [symbol_code(value) for value in symbols] for symbols in block
+        ]
+        heads = [
+            len(symbols) - 1 if head is None else head for symbols in block
+        ]
+        engine = VectorEngine([table], tapes, heads)
+        engine.run(max_steps)
+        for row, symbols in enumerate(block):
+            tape = engine.tape(row)
+            yield {
+                "input": " ".join(str(value) for value in symbols),
+                "halted": bool(engine.halted[row]),
+                "steps": int(engine.steps[row]),
+                "head": engine.head(row),
+                "tape": format_tape(tape),
+            }